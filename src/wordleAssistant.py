@@ -92,9 +92,7 @@
 #Wordle game response:   "graY  gReen  yeLLow  yeLLow  graY"
 #
 #     wordleAssistant will proceed to compute scores for candidate probe words.
-#     Usually you'll get printout within a few seconds, but sometimes when there
-#     are a lot of remaining words to sort through, the computations can take
-#     several minutes.
+#     Usually you'll get printout within a second or two.
 #
 ##############################
 
@@ -176,23 +174,25 @@
 #
 #9. Read out the wordle response, which will be something like,
 #   "yellow gray gray green yellow"
-#   You will convert this to a list of char, like ['l', 'y', 'y', 'r', 'l']
+#   You will convert this to a string of char, like 'lyyrl'
 #
 #10. Use this game response to compose a function call to ask wordleAssistant to find the
 #   remaining words given the wordle response to your probe.
 #
 #>>> <ok_words>, <char_constraints> = wa.pruneWordsPerProbeResponse(<word_list>,
-#                                                                   [<probe_word>, <char_response_list>])
+#                                          wa.makeCueListForResponse(<probe_word>, <char_response>))
 #
-#For char_response_list, make it match the wordle response with the following abbreviations:
+#For char_response, make it match the wordle response with the following abbreviations:
 #   'l' for yeLLow
 #   'y' for graY
 #   'r' for gReen
+#   makeCueListForResponse() turns this into a cue_list, [probe_word, mark_index], where
+#   mark_index is the int 0-242 that the program uses for a game response.
 #
 #   For example, if you use the word, 'story' for your first probe word, your function
 #   call might look like this:
 #
-##>>> ok_words_1, ccl1 = wa.pruneWordsPerProbeResponse(answer_word_list, ['story', ['l', 'y', 'y', 'r', 'l']])
+##>>> ok_words_1, ccl1 = wa.pruneWordsPerProbeResponse(answer_word_list, wa.makeCueListForResponse('story', 'lyyrl'))
 #
 #11. How many words are still allowable?
 #>>> len(ok_words_1)
@@ -221,9 +221,9 @@
 #      next guess and the answer word happens to be the buried in a pile of distractors.
 #      These scores are not rigorous; they are approximations, as the function looks only
 #      one ply deep.
-#   Note: this function can take several minutes to run the first time when the remaining answer
-#   words (i.e. ok_words_1) numbers in the tens or hundreds. It will get faster later as
-#   you reduce this list.
+#   Note: scoring over words from the wordle word lists takes well under a second, as the marks
+#   are looked up in the precomputed mark table. When few answer words remain, the function
+#   also computes expected moves, which takes longer.
 #   This function will print out a list of the 20 best scoring words, along with their scores.
 #
 #13. Usually you'll want to choose the first of these words as your next probe word.
@@ -231,7 +231,7 @@
 #14. Repeat at step 10 with your next probe word, but this time, use the remaining words
 #    in the call to pruneWordsPerProbeResponse(), i.e.
 #
-#>>> ok_words_2, ccl2 = wa.pruneWordsPerProbeResponse(ok_words_1, [<probe_word>, <char_response_list>])
+#>>> ok_words_2, ccl2 = wa.pruneWordsPerProbeResponse(ok_words_1, wa.makeCueListForResponse(<probe_word>, <char_response>))
 #
 #    After a few iterations, the ok_words... list will be whittled down to the final answer word.
 #
@@ -276,10 +276,17 @@
 #wordleAssistant program
 #
 
+import concurrent.futures
+import functools
+import hashlib
 import json
 import math
 import numpy as np
 import os.path as path
+import random
+import struct
+import threading
+import time
 
 
 ########################################
@@ -296,13 +303,27 @@ gl_char_set = ('a', 'b', 'c', 'd', 'e', 'f', 'g', 'h', 'i', 'j',
                'k', 'l', 'm', 'n', 'o', 'p', 'q', 'r', 's', 't',
                'u', 'v', 'w', 'x', 'y', 'z')
 
-gl_correct_response = ['r', 'r', 'r', 'r', 'r']
-gl_correct_tcombo = ('r', 'r', 'r', 'r', 'r')
+#A game response to a probe word is carried through the program as a mark index,
+#an int 0-242.  A mark index is a base 3 number with one digit per char position,
+#char position 0 the most significant digit, and digit values 'r' = 0, 'l' = 1, 'y' = 2.
+#This is the same order as generateAllCharResponseCombos(), so it agrees with
+#gl_tcombo_mark_index_dict.
+#The char response form, like 'ylyyr' or ['y', 'l', 'y', 'y', 'r'], is used only for user
+#input and output and in files.  See charResponseToMarkIndex() and markIndexToCharResponse().
+gl_mark_digit_dict = {'r': 0, 'l': 1, 'y': 2}
+gl_mark_digit_chars = ('r', 'l', 'y')
+#The value of each char position in the mark index
+gl_mark_digit_weights = (81, 27, 9, 3, 1)
+
+gl_correct_mark_index = 0    #'rrrrr'
 
 #The number of words that are counted as a few, for purposes of deciding when
 #to take the extra step of computing expected moves, and other things.
 gl_few_words_len = 10
 
+#The number of top probe word scores that runGame() computes and shows.
+gl_run_game_top_k = 20
+
 #This was determined to be the best initial probe word by running scoreProbeWords()
 #on all words in probe_word_list.  That takes about 26 hours on my laptop.
 #1   ['raise', 61.00086393088553, 168]
@@ -318,19 +339,24 @@ gl_first_probe_word = 'raise'
 #This function applies cue_list to adjust char_constraint_list and then filters
 #allowable answer words.
 #
-#word_list is a list of remaining candidate answer words.
-#cue_list a list of two entries:   [probe_word, char_response_list]
+#word_list is a list of remaining candidate answer words, or a WordSet of them.
+#cue_list a list of two entries:   [probe_word, mark_index]
 #   where probe_word is a 5-character word
-#   and response list is a list of 5 cues in the set { 'r', 'l', 'y' }
+#   and mark_index is the int 0-242 that encodes the game's 5 cues in the set { 'r', 'l', 'y' }
 #   where 'r' means gReen  - the character is in the right position
 #         'l' means yeLLow - the character is in the word but not in that position
 #         'y' means graY   - the character is not in the word
+#   makeCueListForResponse('raise', 'ylyyl') makes a cue_list from a response string.
 #char_constraint_list is a list of list:
 #  char_constraint_list[0] thru char_constraint_list[4]  are sets of allowed characters
 #    in each char position
 #  char_constraint_list[5] is a set of characters that must appear somewhere.
+#or it is a char constraint state, the tuple of char masks made by makeCharConstraintState().
 #
 #Returns two values:  new_allowable_word_list, new_char_constraint_list
+#new_char_constraint_list is the same kind as char_constraint_list, and is a char constraint
+#state if char_constraint_list is not passed.
+#new_allowable_word_list is a WordSet if word_list is.
 #If you pass in a char_constraint_list that already constrains some of the characters,
 #then the new_char_constraint_list returned will add constraints to that based on
 #the cue_list.  This allows you to accumulate constraints for filtering qualified
@@ -341,81 +367,138 @@ gl_first_probe_word = 'raise'
 #char_constraint_list argument.
 def pruneWordsPerProbeResponse(word_list, cue_list, char_constraint_list = None):
     if char_constraint_list == None:
-        char_constraint_list = makeCharConstraintList()
+        char_constraint_list = gl_initial_char_constraint_state
     new_char_constraint_list = updateCharConstraintList(cue_list, char_constraint_list)
-    ok_words = pruneWordsPerCharConstraints(word_list, new_char_constraint_list)
+    if isinstance(word_list, WordSet):
+        ok_words = makeWordSet(pruneWordsPerCharConstraints(word_list.wordList(), new_char_constraint_list))
+    else:
+        ok_words = pruneWordsPerCharConstraints(word_list, new_char_constraint_list)
     return ok_words, new_char_constraint_list
 
 
+#This is pruneWordsPerProbeResponse() for a WordSet, word_set, of remaining answer words,
+#when there is no need to accumulate char constraints.
+#The answer words that a probe word's response allows are exactly the answer words that
+#get the same mark from the probe word, so this looks up that set of words in the
+#(probe word, mark) -> answer words table and intersects it with word_set.
+#A probe word that is not in gl_probe_word_list is pruned per char constraints instead.
+#Returns a WordSet.
+def pruneWordSetPerProbeResponse(word_set, cue_list):
+    i_probe_word = gl_probe_word_index_dict.get(cue_list[0])
+    if i_probe_word == None:
+        ok_words, ccl = pruneWordsPerProbeResponse(word_set, cue_list)
+        return ok_words
+    return word_set & getProbeMarkAnswerWordSet(i_probe_word, cue_list[1])
+
+
 #Run through all words in candidate_probe_word_list and test as the probe word.
 #For each such probe word, run through all words in remaining_word_list pretending
-#it is the correct word.  For each hypothesized correct word compute the
-#cue_list, and from that, a hypothetical char_constraint_list.
-#Using this char_constraint_list, count how many remaining words are allowable.
+#it is the correct word, and compute the mark the game would respond with.
+#The words that remain allowable after that response are exactly the remaining words
+#that get the same mark from the probe word, so rather than pruning the remaining words
+#per hypothetical correct word, this counts how many remaining words get each mark.
+#When all of the words are in the probe and answer word lists, this is done for all of the
+#probe words at once over the mark table by scoreProbeWordIndices().
 #Score each probe word by the average and max number of remaining words that
 #would be returned if the probe word were entered.
 #If probe_word_char_constraint_list is passed, then this is used to filter the probe words
 #so that they meet char constraints from previous cues.  This is used for "hard mode"
 #in which you can only submit probe words that meet all cues returned by previous
 #submissions.
+#hard_mode_cue_list_list may also be passed in hard mode, as the list of previous cues.
+#Then if the probe x probe mark table is loaded, see loadProbeProbeWordMarkAr(), probe words
+#are qualified exactly by the marks they would get from the previous probe words.
 #If the remaining_word_list is small, then in addition, compute an expected moves score,
 #which is the expected moves to completion if that probe word is entered.
+#Either word list may be passed as a WordSet.
+#If num_processes is more than 1, the candidate probe words are split into shards that
+#are scored in a process pool, see scoreProbeWordIndexArsInProcessPool().
+#If top_k is given, only the top_k best probe words by top_k_metric, 'ave' or 'max',
+#are scored in full and returned, sorted by that metric, see scoreProbeWordIndexArsTopK().
+#If screen_p is also True, the top_k are found by two stage screening instead, which is much
+#faster for large remaining word sets but could miss one, see scoreProbeWordIndexArsScreened().
+#If sample_len or time_budget (seconds) is given, the scores are estimated from a random sample
+#of the remaining words, see scoreProbeWordIndexArsSampled().  Then the return value is a pair:
+#the list of scores, and a parallel list of error bars (ave_error, max_error).  Words that are
+#not in the probe and answer word lists cannot be sampled, so they are scored exactly, with
+#error bars of 0.
+#If entropy_p is True, each score also gets the entropy in bits of the probe word's marks on
+#the remaining words, after expected moves, which is None if it was not computed.
 #Returns a list of tuple: (probe_word, ave_words_remaining, max_words_remaining)  or
 #                         (probe_word, ave_words_remaining, max_words_remaining, expected_moves)
+#                         (probe_word, ave_words_remaining, max_words_remaining, expected_moves, entropy)
 def scoreProbeWords(remaining_word_list, candidate_probe_word_list,
                     probe_word_char_constraint_list = None,
-                    print_p = True):
+                    print_p = True, num_processes = 1, hard_mode_cue_list_list = None,
+                    top_k = None, top_k_metric = 'ave', screen_p = False,
+                    sample_len = None, time_budget = None, entropy_p = False):
     if len(remaining_word_list) == 0:
         return None
-
-    #for command line feedback
-    dot_freq = int(10000/len(remaining_word_list))
-    probe_word_score_list = []
+    if isinstance(candidate_probe_word_list, WordSet):
+        candidate_probe_word_list = candidate_probe_word_list.wordList()
 
     #deal with hard mode
+    probe_word_index_ar = None
+    if probe_word_char_constraint_list == None and hard_mode_cue_list_list != None:
+        probe_word_char_constraint_list = makeCharConstraintStateForCues(hard_mode_cue_list_list)
     if probe_word_char_constraint_list != None:
-        qualified_candidate_probe_word_list = \
-             pruneWordsPerCharConstraints(candidate_probe_word_list, probe_word_char_constraint_list)
+        if hard_mode_cue_list_list != None and gl_probe_probe_word_mark_ar is not None:
+            #qualify the probe words exactly per the probe x probe mark table
+            if candidate_probe_word_list is gl_probe_word_list:
+                probe_word_index_ar = qualifyProbeWordIndexArPerCues(hard_mode_cue_list_list)
+            else:
+                candidate_probe_word_index_ar = makeWordIndexAr(candidate_probe_word_list,
+                                                                gl_probe_word_index_dict)
+                if candidate_probe_word_index_ar is not None:
+                    probe_word_index_ar = qualifyProbeWordIndexArPerCues(hard_mode_cue_list_list,
+                                                                         candidate_probe_word_index_ar)
+        if probe_word_index_ar is None and candidate_probe_word_list is gl_probe_word_list:
+            #look up the qualified probe words in the inverted letter position index
+            probe_word_index_ar = qualifyProbeWordIndexAr(probe_word_char_constraint_list)
+        if probe_word_index_ar is not None:
+            qualified_candidate_probe_word_list = [gl_probe_word_list[i_word] for i_word in probe_word_index_ar]
+        else:
+            qualified_candidate_probe_word_list = \
+                pruneWordsPerCharConstraints(candidate_probe_word_list, probe_word_char_constraint_list)
         print('Hard Mode: pruning candidate_probe_word_list down from ' + str(len(candidate_probe_word_list)) + ' to ' + str(len(qualified_candidate_probe_word_list)) + ' candidates that meet char constraints')
     else:
         qualified_candidate_probe_word_list = candidate_probe_word_list
 
+    #When the words are in the probe and answer word lists, score all of the probe words
+    #at once over the mark table
+    if isinstance(remaining_word_list, WordSet):
+        remaining_word_index_ar = remaining_word_list.indexAr()
+        remaining_word_list = remaining_word_list.wordList()
+    else:
+        remaining_word_index_ar = makeWordIndexAr(remaining_word_list, gl_answer_word_index_dict)
+    if remaining_word_index_ar is not None:
+        if probe_word_index_ar is None:
+            probe_word_index_ar = makeWordIndexAr(qualified_candidate_probe_word_list,
+                                                  gl_probe_word_index_dict)
+        if probe_word_index_ar is not None:
+            return scoreProbeWordIndices(remaining_word_index_ar, probe_word_index_ar, print_p,
+                                         num_processes, top_k, top_k_metric, screen_p,
+                                         sample_len, time_budget, entropy_p)
+
+    #for command line feedback
+    dot_freq = int(10000/len(remaining_word_list))
+    probe_word_score_list = []
+    remaining_word_set = set(remaining_word_list)
+
     #main loop over probe_words
     probe_word_count = 0
     for probe_word in qualified_candidate_probe_word_list: #consider all candidate probe words, even ones
                                                            #that are not allowable
         #print('\nprobe_word: ' + probe_word)  
-        remaining_words_sum = 0
-        max_remaining_words = 0
-        expected_moves_sum = 0
-        for hypothetical_correct_word in remaining_word_list:
-            char_response_list = markProbeWordAgainstCorrectWord(probe_word, hypothetical_correct_word)
-            #Only if the remaining words have been pruned down to a small number, 
-            #count expected moves to answer.  This function is recursive so cannot be
-            #used with a large remaining_word_list
-            if probe_word in remaining_word_list and len(remaining_word_list) <= gl_few_words_len:
-                expected_moves = countExpectedMovesToAnswer(probe_word, hypothetical_correct_word,
-                                                            remaining_word_list)
-                expected_moves_sum += expected_moves
-            if char_response_list == gl_correct_response:
-                continue   #the correct probe says no more remaining words
-            new_remaining_word_list, new_char_constraint_list = \
-                 pruneWordsPerProbeResponse(remaining_word_list,
-                                            [probe_word, char_response_list])
-            num_remaining_words = len(new_remaining_word_list)
-            if len(new_remaining_word_list) == len(remaining_word_list):
-                num_remaining_words = 10000  #probe word does not reduce remaining_word_list
-                #print('new_remaining_word_list: ' + str(new_remaining_word_list) + ' setting num_remaining_words to 1000')
-            remaining_words_sum += num_remaining_words
-            max_remaining_words = max(num_remaining_words, max_remaining_words)
-            #print('hyp correct word: ' + hypothetical_correct_word + ' num_remaining_words:' + str(num_remaining_words) + ' : ' + str(new_remaining_word_list))
-
-        if len(remaining_word_list) == 0:  #no valid words, return a high scoring nonsense response 
-            return ['', 1000, 1000]
-        ave_remaining_words = remaining_words_sum / len(remaining_word_list)
-        probe_word_score = [probe_word, ave_remaining_words, max_remaining_words]
-        if expected_moves_sum > 0:
-            probe_word_score.append(expected_moves_sum/len(remaining_word_list))
+        #bucket the remaining words by the mark they get from probe_word
+        mark_count_ar = np.bincount(markProbeWordAgainstAnswerWords(probe_word, remaining_word_list),
+                                    minlength=243)
+        ave_remaining_words, max_remaining_words = \
+            scoreProbeWordPerMarkCounts(mark_count_ar, len(remaining_word_list))
+        probe_word_score = makeProbeWordScore(probe_word, ave_remaining_words, max_remaining_words,
+                                              remaining_word_list, remaining_word_set)
+        if entropy_p:
+            appendProbeWordScoreEntropy(probe_word_score, float(figureEntropiesPerMarkCounts(mark_count_ar)))
         probe_word_count += 1
         probe_word_score_list.append(probe_word_score)
 
@@ -429,7 +512,119 @@ def scoreProbeWords(remaining_word_list, candidate_probe_word_list,
 
     if dot_freq > 0:
         print('')
-    probe_word_score_list.sort(key = lambda x: x[1])
+    if sample_len != None or time_budget != None:
+        return sortProbeWordScores(probe_word_score_list, print_p), \
+            [(0.0, 0.0)] * len(probe_word_score_list)
+    if top_k != None:
+        sortProbeWordScores(probe_word_score_list, False, top_k_metric)
+        return sortProbeWordScores(probe_word_score_list[0:top_k], print_p, top_k_metric)
+    return sortProbeWordScores(probe_word_score_list, print_p)
+
+
+#This is the vectorized mode of scoreProbeWords().
+#remaining_word_index_ar is a numpy array of indices of the remaining words in gl_answer_word_list,
+#and probe_word_index_ar is a numpy array of indices of the candidate probe words in
+#gl_probe_word_list.  Hard mode pruning should already have been applied to the probe words.
+#Returns the same list of scores as scoreProbeWords(), sorted by ave_words_remaining,
+#or if top_k is given, just the top_k scores sorted by top_k_metric.  Top k scoring
+#prunes probe words as it goes, so it runs in this process regardless of num_processes.
+#screen_p selects scoreProbeWordIndexArsScreened() for top k scoring.
+#sample_len or time_budget selects scoreProbeWordIndexArsSampled(), and then the scores are
+#returned with a list of error bars, as scoreProbeWords() describes.
+#entropy_p adds the entropy column, see figureProbeWordEntropyArs().
+def scoreProbeWordIndices(remaining_word_index_ar, probe_word_index_ar, print_p = True,
+                          num_processes = 1, top_k = None, top_k_metric = 'ave', screen_p = False,
+                          sample_len = None, time_budget = None, entropy_p = False):
+    if len(remaining_word_index_ar) == 0:
+        return None
+    error_bar_list = None
+    if sample_len != None or time_budget != None:
+        ave_remaining_words_ar, max_remaining_words_ar, ave_error_ar, max_error_ar, _ = \
+            scoreProbeWordIndexArsSampled(remaining_word_index_ar, probe_word_index_ar,
+                                          sample_len, time_budget)
+        #put everything in score order here, so that the error bars stay parallel to the scores
+        order_ar = np.argsort(ave_remaining_words_ar, kind='stable')
+        probe_word_index_ar = probe_word_index_ar[order_ar]
+        ave_remaining_words_ar = ave_remaining_words_ar[order_ar]
+        max_remaining_words_ar = max_remaining_words_ar[order_ar]
+        error_bar_list = list(zip(ave_error_ar[order_ar].tolist(), max_error_ar[order_ar].tolist()))
+    elif top_k != None:
+        if screen_p:
+            top_score_ars = scoreProbeWordIndexArsScreened(remaining_word_index_ar, probe_word_index_ar,
+                                                           top_k, top_k_metric)
+        else:
+            top_score_ars = scoreProbeWordIndexArsTopK(remaining_word_index_ar, probe_word_index_ar,
+                                                       top_k, top_k_metric)
+        if top_score_ars == None:
+            return None
+        top_i_probe_ar, ave_remaining_words_ar, max_remaining_words_ar = top_score_ars
+        probe_word_index_ar = probe_word_index_ar[top_i_probe_ar]
+    elif num_processes > 1:
+        ave_remaining_words_ar, max_remaining_words_ar = \
+            scoreProbeWordIndexArsInProcessPool(remaining_word_index_ar, probe_word_index_ar,
+                                                num_processes)
+    else:
+        ave_remaining_words_ar, max_remaining_words_ar = \
+            scoreProbeWordIndexArs(remaining_word_index_ar, probe_word_index_ar)
+    if entropy_p:
+        entropy_ar = figureProbeWordEntropyArs(remaining_word_index_ar, probe_word_index_ar)
+    remaining_word_list = [gl_answer_word_list[i_word] for i_word in remaining_word_index_ar]
+    remaining_word_set = set(remaining_word_list)
+    probe_word_score_list = []
+    for i_probe in range(len(probe_word_index_ar)):
+        probe_word = gl_probe_word_list[probe_word_index_ar[i_probe]]
+        probe_word_score = makeProbeWordScore(probe_word, float(ave_remaining_words_ar[i_probe]),
+                                              int(max_remaining_words_ar[i_probe]),
+                                              remaining_word_list, remaining_word_set)
+        if entropy_p:
+            appendProbeWordScoreEntropy(probe_word_score, float(entropy_ar[i_probe]))
+        probe_word_score_list.append(probe_word_score)
+        if print_p:
+            print(str(i_probe + 1) + '  ' + str(probe_word_score))
+    if error_bar_list != None:
+        return sortProbeWordScores(probe_word_score_list, print_p), error_bar_list
+    return sortProbeWordScores(probe_word_score_list, print_p, top_k_metric)
+
+
+#Makes the score list for one probe word, [probe_word, ave_words_remaining, max_words_remaining]
+#Only if the remaining words have been pruned down to a small number, and probe_word is
+#one of them, count expected moves to answer and append that.  For answer words that is
+#figureExpectedMovesToAnswer(), memoized, for up to gl_expected_moves_max_words_len remaining
+#words.  Otherwise countExpectedMovesToAnswer() is recursive so cannot be used with a large
+#remaining_word_list.
+def makeProbeWordScore(probe_word, ave_remaining_words, max_remaining_words,
+                       remaining_word_list, remaining_word_set):
+    probe_word_score = [probe_word, ave_remaining_words, max_remaining_words]
+    if probe_word in remaining_word_set and len(remaining_word_list) <= gl_expected_moves_max_words_len:
+        expected_moves = figureExpectedMovesToAnswer(probe_word, remaining_word_list)
+        if expected_moves != None:
+            probe_word_score.append(expected_moves)
+            return probe_word_score
+    expected_moves_sum = 0
+    if probe_word in remaining_word_set and len(remaining_word_list) <= gl_few_words_len:
+        for hypothetical_correct_word in remaining_word_list:
+            expected_moves = countExpectedMovesToAnswer(probe_word, hypothetical_correct_word,
+                                                        remaining_word_list)
+            expected_moves_sum += expected_moves
+    if expected_moves_sum > 0:
+        probe_word_score.append(expected_moves_sum/len(remaining_word_list))
+    return probe_word_score
+
+
+#Appends entropy to probe_word_score, after a None for expected moves if there are none.
+def appendProbeWordScoreEntropy(probe_word_score, entropy):
+    if len(probe_word_score) == 3:
+        probe_word_score.append(None)
+    probe_word_score.append(entropy)
+
+
+#Sorts probe_word_score_list in place by ave_words_remaining, and returns it.
+#If sort_metric is 'max', sorts by max_words_remaining, then ave_words_remaining.
+def sortProbeWordScores(probe_word_score_list, print_p = True, sort_metric = 'ave'):
+    if sort_metric == 'max':
+        probe_word_score_list.sort(key = lambda x: (x[2], x[1]))
+    else:
+        probe_word_score_list.sort(key = lambda x: x[1])
     if print_p:
         print('top scores:')
         for score in probe_word_score_list[0:20]:
@@ -437,7 +632,445 @@ def scoreProbeWords(remaining_word_list, candidate_probe_word_list,
     return probe_word_score_list
 
 
-gl_counted_already_p = [False] * 5
+#The number of remaining words counted for a response that does not reduce the
+#remaining words at all, so that such probe words score badly.
+gl_no_reduction_count = 10000
+
+
+#mark_count_ar is a numpy array [243] of the number of remaining words that get each
+#mark from a probe word, where num_remaining_words is the total.
+#If the game gives mark m, then the words remaining are the mark_count_ar[m] words
+#that get mark m.  The correct mark leaves no more remaining words, and a mark that
+#leaves all of the remaining words counts as gl_no_reduction_count.
+#Returns two values: the average over the remaining words (as hypothetical correct
+#words) of the number of words remaining, and the max.
+def scoreProbeWordPerMarkCounts(mark_count_ar, num_remaining_words):
+    count_ar = mark_count_ar[1:]     #skip gl_correct_mark_index
+    words_remaining_ar = np.where(count_ar == num_remaining_words, gl_no_reduction_count, count_ar)
+    remaining_words_sum = int(np.dot(count_ar, words_remaining_ar))
+    max_remaining_words = int(words_remaining_ar.max())
+    return remaining_words_sum / num_remaining_words, max_remaining_words
+
+
+#Scores all of the probe words in probe_word_index_ar against the remaining words in
+#remaining_word_index_ar, as scoreProbeWordPerMarkCounts() does for one probe word.
+#The marks for a block of probe words are sliced out of the mark table and offset by
+#243 * (row in the block), so that one bincount counts the marks of every probe word in
+#the block.
+#Returns two numpy arrays, parallel to probe_word_index_ar:
+#  ave_remaining_words_ar, max_remaining_words_ar
+def scoreProbeWordIndexArs(remaining_word_index_ar, probe_word_index_ar, block_rows = 64):
+    num_remaining_words = len(remaining_word_index_ar)
+    num_probe_words = len(probe_word_index_ar)
+    probe_answer_word_mark_ar = getProbeAnswerWordMarkRows(probe_word_index_ar)
+    ave_remaining_words_ar = np.zeros(num_probe_words, dtype=np.float64)
+    max_remaining_words_ar = np.zeros(num_probe_words, dtype=np.int64)
+    for i_start in range(0, num_probe_words, block_rows):
+        block_index_ar = probe_word_index_ar[i_start:i_start + block_rows]
+        n_block = len(block_index_ar)
+        mark_ar = probe_answer_word_mark_ar[block_index_ar][:, remaining_word_index_ar]
+        offset_mark_ar = mark_ar + (np.arange(n_block, dtype=np.intp) * 243)[:, None]
+        mark_count_ar = np.bincount(offset_mark_ar.ravel(), minlength=n_block * 243).reshape(n_block, 243)
+        count_ar = mark_count_ar[:, 1:]     #skip gl_correct_mark_index
+        words_remaining_ar = np.where(count_ar == num_remaining_words, gl_no_reduction_count, count_ar)
+        i_end = i_start + n_block
+        ave_remaining_words_ar[i_start:i_end] = (count_ar * words_remaining_ar).sum(axis=1) / num_remaining_words
+        max_remaining_words_ar[i_start:i_end] = words_remaining_ar.max(axis=1)
+    return ave_remaining_words_ar, max_remaining_words_ar
+
+
+#The metrics that scoreProbeWordIndexArsTopK() can pick the top probe words by.
+gl_top_k_metrics = ('ave', 'max')
+
+
+#This is scoreProbeWordIndexArs() for only the top_k best probe words in probe_word_index_ar
+#by top_k_metric, 'ave' or 'max' words remaining.  Ties are broken as a stable sort would:
+#by ave words remaining for 'max', and then by position in probe_word_index_ar.
+#Every probe word is scored, and the top_k are picked from the scores.  Dropping probe words
+#part way through counting their marks, once a lower bound on their score is out of the top
+#k, does not pay:  the bounds only rule a probe word out when most of its marks are counted.
+#Returns three numpy arrays, best first:
+#  top_i_probe_ar, the positions in probe_word_index_ar of the top probe words,
+#  ave_remaining_words_ar, and max_remaining_words_ar.
+def scoreProbeWordIndexArsTopK(remaining_word_index_ar, probe_word_index_ar, top_k,
+                               top_k_metric = 'ave'):
+    if top_k_metric not in gl_top_k_metrics:
+        print('Problem: top_k_metric ' + str(top_k_metric) + ' is not one of ' + str(gl_top_k_metrics))
+        return None
+    if top_k < 1:
+        print('Problem: top_k ' + str(top_k) + ' is less than 1')
+        return None
+    num_remaining_words = len(remaining_word_index_ar)
+    ave_remaining_words_ar, max_remaining_words_ar = \
+        scoreProbeWordIndexArs(remaining_word_index_ar, probe_word_index_ar)
+    #sort on the exact remaining words sums, so that ties in ave are ties
+    remaining_words_sum_ar = np.rint(ave_remaining_words_ar * num_remaining_words).astype(np.int64)
+    if top_k_metric == 'ave':
+        top_i_probe_ar = np.argsort(remaining_words_sum_ar, kind='stable')[0:top_k]
+    else:
+        top_i_probe_ar = np.lexsort((remaining_words_sum_ar, max_remaining_words_ar))[0:top_k]
+    return top_i_probe_ar, remaining_words_sum_ar[top_i_probe_ar] / num_remaining_words, \
+        max_remaining_words_ar[top_i_probe_ar]
+
+
+#Two stage screening of probe words, for large remaining word sets.  The first stage
+#estimates every probe word's score from the marks of a random sample of the remaining words,
+#and the second stage scores exactly only the probe words whose estimates say they could be
+#in the top k.  See scoreProbeWordIndexArsScreened().
+gl_screen_sample_len = 256
+gl_screen_shortlist_len = 300
+
+#The recall guarantee of screening.  A probe word is scored exactly if the lower end of
+#its confidence interval, its estimate less gl_screen_z standard errors, could place it
+#in the top k.  At 3, each of the true top k is missed with odds of about 1 in 700.
+#math.inf scores exactly every probe word that a hard lower bound cannot rule out, so the
+#top k are always found, but that bound is weak and screening saves little.
+gl_screen_z = 3.0
+
+gl_screen_random_seed = 2315
+
+
+#Estimates the scores of the probe words in probe_word_index_ar over the remaining words in
+#remaining_word_index_ar from the marks on sample_word_index_ar, a random sample of them.
+#Returns what estimateProbeWordScoresFromMarkCounts() does.
+def estimateProbeWordScoresFromSample(remaining_word_index_ar, probe_word_index_ar,
+                                      sample_word_index_ar):
+    mark_count_ar = countProbeWordMarks(probe_word_index_ar, sample_word_index_ar)
+    return estimateProbeWordScoresFromMarkCounts(mark_count_ar, len(sample_word_index_ar),
+                                                 len(remaining_word_index_ar))
+
+
+#Returns a numpy array [len(probe_word_index_ar), 243] of the number of words in
+#word_index_ar, indices into gl_answer_word_list, that get each mark from each probe word.
+def countProbeWordMarks(probe_word_index_ar, word_index_ar, block_rows = 1024):
+    probe_answer_word_mark_ar = getProbeAnswerWordMarkRows(probe_word_index_ar)
+    num_probe_words = len(probe_word_index_ar)
+    mark_count_ar = np.zeros([num_probe_words, 243], dtype=np.int32)
+    for i_start in range(0, num_probe_words, block_rows):
+        block_index_ar = probe_word_index_ar[i_start:i_start + block_rows]
+        n_block = len(block_index_ar)
+        mark_ar = probe_answer_word_mark_ar[block_index_ar][:, word_index_ar]
+        offset_mark_ar = mark_ar + (np.arange(n_block, dtype=np.int32) * 243)[:, None]
+        mark_count_ar[i_start:i_start + n_block] = \
+            np.bincount(offset_mark_ar.ravel(), minlength=n_block * 243).reshape(n_block, 243)
+    return mark_count_ar
+
+
+#mark_count_ar is a numpy array [num probe words, 243] of the number of words in a random
+#sample of num_sample_words of the num_remaining_words remaining words that get each mark.
+#For a sampled word in a mark bucket with s of the n sampled words, the number of remaining
+#words that mark leaves is estimated as 1 + (num_remaining_words - 1) * (s - 1) / (n - 1).
+#The estimate of ave words remaining is the mean of that over the sampled words.  It counts
+#pairs of sampled words in the same bucket, so its standard error is that of a U-statistic:
+#  sqrt((4 * var(x) / n + 2 * (num_remaining_words - 1)^2 * p * (1 - p) / (n * (n - 1))) * fpc)
+#where var(x) is the variance over the sampled words, p is the estimated chance that two words
+#share a bucket, and fpc is the finite population correction.  The estimate of max words remaining is the largest bucket scaled
+#to num_remaining_words, and its standard error is the binomial one for that bucket's share.
+#If every sampled word is in one bucket, the probe word likely does not reduce the remaining
+#words at all, so both estimates are gl_no_reduction_count, as scoreProbeWordPerMarkCounts()
+#counts that, with standard errors that reach down to the hard lower bounds.
+#Returns four numpy arrays, one entry per probe word:
+#  ave_estimate_ar, ave_std_err_ar, max_estimate_ar, max_std_err_ar
+#and also the hard lower bounds on the remaining words sum (ave * num_remaining_words) and max
+#words remaining that the sample counts give, as a pair of arrays.  Bucket counts only grow,
+#and each word not sampled (other than the probe word itself, which gets the correct mark) adds
+#at least 1 to the sum of squared bucket counts, so the bounds are
+#   sum(count^2) + (num_remaining_words - num_sample_words - 1)   and   max(count)
+def estimateProbeWordScoresFromMarkCounts(mark_count_ar, num_sample_words, num_remaining_words):
+    count_ar = mark_count_ar[:, 1:].astype(np.int64)     #skip gl_correct_mark_index
+    square_ar = count_ar * count_ar
+    count_sum_ar = count_ar.sum(axis=1)
+    square_sum_ar = square_ar.sum(axis=1)
+    cube_sum_ar = np.einsum('ij,ij->i', square_ar, count_ar)
+    max_count_ar = count_ar.max(axis=1)
+
+    #With x = 1 + c * (s - 1) per sampled word, sum(x) and sum(x^2) over the sampled words
+    #come from the sums of s, s^2 and s^3 over the buckets.
+    c = (num_remaining_words - 1) / max(1, num_sample_words - 1)
+    x_sum_ar = count_sum_ar + c * (square_sum_ar - count_sum_ar)
+    x_square_sum_ar = count_sum_ar + 2 * c * (square_sum_ar - count_sum_ar) + \
+        c * c * (cube_sum_ar - 2 * square_sum_ar + count_sum_ar)
+    ave_estimate_ar = x_sum_ar / num_sample_words
+    x_variance_ar = np.maximum(x_square_sum_ar / num_sample_words - ave_estimate_ar * ave_estimate_ar, 0)
+    finite_population_correction = max(0, 1 - num_sample_words / num_remaining_words)
+    pair_p_ar = np.clip((ave_estimate_ar - 1) / max(1, num_remaining_words - 1), 0, 1)
+    ave_std_err_ar = np.sqrt((4 * x_variance_ar / num_sample_words +
+                              2 * (num_remaining_words - 1) ** 2 * pair_p_ar * (1 - pair_p_ar) /
+                              max(1, num_sample_words * (num_sample_words - 1))) *
+                             finite_population_correction)
+
+    max_share_ar = max_count_ar / num_sample_words
+    max_estimate_ar = max_share_ar * num_remaining_words
+    max_std_err_ar = num_remaining_words * \
+        np.sqrt(max_share_ar * (1 - max_share_ar) / num_sample_words * finite_population_correction)
+
+    remaining_words_sum_bound_ar = square_sum_ar + max(0, num_remaining_words - num_sample_words - 1)
+
+    no_reduction_p_ar = max_count_ar == num_sample_words
+    if no_reduction_p_ar.any():
+        ave_estimate_ar[no_reduction_p_ar] = gl_no_reduction_count
+        ave_std_err_ar[no_reduction_p_ar] = \
+            gl_no_reduction_count - remaining_words_sum_bound_ar[no_reduction_p_ar] / num_remaining_words
+        max_estimate_ar[no_reduction_p_ar] = gl_no_reduction_count
+        max_std_err_ar[no_reduction_p_ar] = gl_no_reduction_count - max_count_ar[no_reduction_p_ar]
+    return ave_estimate_ar, ave_std_err_ar, max_estimate_ar, max_std_err_ar, \
+        (remaining_words_sum_bound_ar, max_count_ar)
+
+
+#This is scoreProbeWordIndexArsTopK() by two stage screening.  Every probe word's score is
+#estimated from a random sample of gl_screen_sample_len remaining words, by
+#estimateProbeWordScoresFromSample().  The shortlist_len probe words with the best estimates
+#are scored exactly, and the top_k-th best of those exact scores is the cutoff.  Then the other
+#probe words are scored exactly only if they could beat the cutoff: if their estimate less
+#screen_z standard errors, and their hard lower bound, are both at most the cutoff.
+#See gl_screen_z for the recall this gives.  If the remaining words are not many more than
+#a sample, or there are not many probe words, this just calls scoreProbeWordIndexArsTopK().
+#Returns the same three numpy arrays as scoreProbeWordIndexArsTopK().
+def scoreProbeWordIndexArsScreened(remaining_word_index_ar, probe_word_index_ar, top_k,
+                                   top_k_metric = 'ave', shortlist_len = None, screen_z = None,
+                                   sample_len = None):
+    if shortlist_len == None:
+        shortlist_len = gl_screen_shortlist_len
+    if screen_z == None:
+        screen_z = gl_screen_z
+    if sample_len == None:
+        sample_len = gl_screen_sample_len
+    num_remaining_words = len(remaining_word_index_ar)
+    if top_k_metric not in gl_top_k_metrics or num_remaining_words <= 2 * sample_len or \
+       len(probe_word_index_ar) <= 2 * max(shortlist_len, top_k):
+        return scoreProbeWordIndexArsTopK(remaining_word_index_ar, probe_word_index_ar,
+                                          top_k, top_k_metric)
+    rng = np.random.default_rng(gl_screen_random_seed)
+    sample_word_index_ar = np.sort(rng.choice(remaining_word_index_ar, sample_len, replace=False))
+    ave_estimate_ar, ave_std_err_ar, max_estimate_ar, max_std_err_ar, (sum_bound_ar, max_bound_ar) = \
+        estimateProbeWordScoresFromSample(remaining_word_index_ar, probe_word_index_ar,
+                                          sample_word_index_ar)
+
+    #stage 2: score the shortlist exactly to find the cutoff
+    if top_k_metric == 'ave':
+        estimate_order_ar = np.argsort(ave_estimate_ar, kind='stable')
+    else:
+        estimate_order_ar = np.lexsort((ave_estimate_ar, max_estimate_ar))
+    shortlist_i_probe_ar = estimate_order_ar[0:max(shortlist_len, top_k)]
+    ave_remaining_words_ar, max_remaining_words_ar = \
+        scoreProbeWordIndexArs(remaining_word_index_ar, probe_word_index_ar[shortlist_i_probe_ar])
+    if top_k_metric == 'ave':
+        cutoff = np.sort(ave_remaining_words_ar)[top_k - 1]
+        lower_bound_ar = sum_bound_ar / num_remaining_words
+        if screen_z != math.inf:
+            lower_bound_ar = np.maximum(ave_estimate_ar - screen_z * ave_std_err_ar, lower_bound_ar)
+    else:
+        cutoff = np.sort(max_remaining_words_ar)[top_k - 1]
+        lower_bound_ar = max_bound_ar
+        if screen_z != math.inf:
+            lower_bound_ar = np.maximum(max_estimate_ar - screen_z * max_std_err_ar, lower_bound_ar)
+    could_beat_cutoff_p_ar = lower_bound_ar <= cutoff
+    could_beat_cutoff_p_ar[shortlist_i_probe_ar] = False
+    extra_i_probe_ar = np.flatnonzero(could_beat_cutoff_p_ar)
+    if len(extra_i_probe_ar) > 0:
+        extra_ave_ar, extra_max_ar = \
+            scoreProbeWordIndexArs(remaining_word_index_ar, probe_word_index_ar[extra_i_probe_ar])
+        scored_i_probe_ar = np.concatenate([shortlist_i_probe_ar, extra_i_probe_ar])
+        ave_remaining_words_ar = np.concatenate([ave_remaining_words_ar, extra_ave_ar])
+        max_remaining_words_ar = np.concatenate([max_remaining_words_ar, extra_max_ar])
+    else:
+        scored_i_probe_ar = shortlist_i_probe_ar
+
+    #sort as scoreProbeWordIndexArsTopK() does, on the exact remaining words sums
+    remaining_words_sum_ar = np.rint(ave_remaining_words_ar * num_remaining_words).astype(np.int64)
+    if top_k_metric == 'ave':
+        top_ar = np.lexsort((scored_i_probe_ar, remaining_words_sum_ar))[0:top_k]
+    else:
+        top_ar = np.lexsort((scored_i_probe_ar, remaining_words_sum_ar, max_remaining_words_ar))[0:top_k]
+    return scored_i_probe_ar[top_ar], ave_remaining_words_ar[top_ar], max_remaining_words_ar[top_ar]
+
+
+#For debugging screening.  Scores the probe words in candidate_probe_word_list over
+#remaining_word_list both exhaustively and by scoreProbeWordIndexArsScreened(), and prints
+#how many of the exhaustive top_k the screening found, and the time each took.
+#Returns the recall, the fraction of the exhaustive top_k found.
+def checkProbeWordScreening(remaining_word_list = None, candidate_probe_word_list = None,
+                            top_k = 20, top_k_metric = 'ave', screen_z = None):
+    if remaining_word_list == None:
+        remaining_word_list = gl_answer_word_list
+    if candidate_probe_word_list == None:
+        candidate_probe_word_list = gl_probe_word_list
+    remaining_word_index_ar = makeWordIndexAr(remaining_word_list, gl_answer_word_index_dict)
+    probe_word_index_ar = makeWordIndexAr(candidate_probe_word_list, gl_probe_word_index_dict)
+    if remaining_word_index_ar is None or probe_word_index_ar is None:
+        print('Problem: checkProbeWordScreening() needs words in the answer and probe word lists')
+        return None
+    start_time = time.time()
+    exhaustive_top_i_probe_ar, _, _ = \
+        scoreProbeWordIndexArsTopK(remaining_word_index_ar, probe_word_index_ar, top_k, top_k_metric)
+    exhaustive_time = time.time() - start_time
+    start_time = time.time()
+    screened_top_i_probe_ar, _, _ = \
+        scoreProbeWordIndexArsScreened(remaining_word_index_ar, probe_word_index_ar, top_k,
+                                       top_k_metric, screen_z = screen_z)
+    screened_time = time.time() - start_time
+    found_count = len(set(exhaustive_top_i_probe_ar.tolist()) & set(screened_top_i_probe_ar.tolist()))
+    recall = found_count / len(exhaustive_top_i_probe_ar)
+    print('screening found ' + str(found_count) + ' of the top ' + str(len(exhaustive_top_i_probe_ar)) + \
+          ' probe words, recall: ' + str(recall))
+    print('exhaustive: {0:.3f} sec   screened: {1:.3f} sec'.format(exhaustive_time, screened_time))
+    if list(exhaustive_top_i_probe_ar) != list(screened_top_i_probe_ar):
+        missed_word_list = [candidate_probe_word_list[i_probe] for i_probe in exhaustive_top_i_probe_ar
+                            if i_probe not in screened_top_i_probe_ar]
+        print('missed: ' + str(missed_word_list))
+    return recall
+
+
+#Sampled scoring is done a block of this many sampled words at a time, so that a time
+#budget can stop it between blocks.
+gl_sample_block_len = 256
+gl_sample_leader_len = 16
+
+
+#Approximately scores the probe words in probe_word_index_ar over the remaining words in
+#remaining_word_index_ar from a random sample of them, for batch jobs that can trade some
+#accuracy for speed.  Words are sampled in random order a block of gl_sample_block_len at a time
+#until sample_len have been sampled or time_budget seconds have passed, whichever comes first.
+#If neither is given, sample_len is gl_screen_sample_len.  Scores are estimated by
+#estimateProbeWordScoresFromMarkCounts(), with error bars of z standard errors (gl_screen_z).
+#The gl_sample_leader_len probe words with the best ave estimates, and any whose sampled words
+#all got one mark, are scored exactly, and the best of them is the leader.  Every probe word whose ave interval reaches the leader's exact
+#score is then scored exactly too.  Exactly scored probe words get error bars of 0.
+#Returns five numpy arrays, parallel to probe_word_index_ar:
+#  ave_remaining_words_ar, max_remaining_words_ar, ave_error_ar, max_error_ar, exact_p_ar
+def scoreProbeWordIndexArsSampled(remaining_word_index_ar, probe_word_index_ar, sample_len = None,
+                                  time_budget = None, z = None):
+    start_time = time.time()
+    if sample_len == None and time_budget == None:
+        sample_len = gl_screen_sample_len
+    if z == None:
+        z = gl_screen_z
+    num_remaining_words = len(remaining_word_index_ar)
+    num_probe_words = len(probe_word_index_ar)
+    if sample_len == None:
+        sample_len = num_remaining_words
+    elif sample_len >= num_remaining_words:
+        ave_remaining_words_ar, max_remaining_words_ar = \
+            scoreProbeWordIndexArs(remaining_word_index_ar, probe_word_index_ar)
+        return ave_remaining_words_ar, max_remaining_words_ar, np.zeros(num_probe_words), \
+            np.zeros(num_probe_words), np.ones(num_probe_words, dtype=bool)
+
+    rng = np.random.default_rng(gl_screen_random_seed)
+    sample_word_index_ar = rng.permutation(remaining_word_index_ar)[0:sample_len]
+    mark_count_ar = np.zeros([num_probe_words, 243], dtype=np.int32)
+    num_sample_words = 0
+    while num_sample_words < sample_len:
+        block_word_index_ar = sample_word_index_ar[num_sample_words:num_sample_words + gl_sample_block_len]
+        mark_count_ar += countProbeWordMarks(probe_word_index_ar, block_word_index_ar)
+        num_sample_words += len(block_word_index_ar)
+        if time_budget != None and time.time() - start_time >= time_budget:
+            break
+    ave_estimate_ar, ave_std_err_ar, max_estimate_ar, max_std_err_ar, (sum_bound_ar, max_bound_ar) = \
+        estimateProbeWordScoresFromMarkCounts(mark_count_ar, num_sample_words, num_remaining_words)
+    ave_remaining_words_ar = np.maximum(ave_estimate_ar, sum_bound_ar / num_remaining_words)
+    max_remaining_words_ar = np.maximum(np.rint(max_estimate_ar).astype(np.int64), max_bound_ar)
+    ave_error_ar = z * ave_std_err_ar
+    max_error_ar = z * max_std_err_ar
+
+    #refine the probe words that could be the leader
+    lower_bound_ar = np.maximum(ave_remaining_words_ar - ave_error_ar, sum_bound_ar / num_remaining_words)
+    #a probe word can have a sampled error of 0 and still be off, so the exactly scored ones
+    #are tracked apart from their error bars
+    exact_p_ar = np.zeros(num_probe_words, dtype=bool)
+    exact_p_ar[np.argsort(ave_remaining_words_ar, kind='stable')[0:gl_sample_leader_len]] = True
+    #the estimate for a probe word whose sample all got one mark is only a guess, see
+    #estimateProbeWordScoresFromMarkCounts(), and there are few of them
+    exact_p_ar[ave_estimate_ar == gl_no_reduction_count] = True
+    scored_p_ar = np.zeros(num_probe_words, dtype=bool)
+    leader_ave = None
+    while True:
+        exact_i_probe_ar = np.flatnonzero(exact_p_ar & ~scored_p_ar)
+        if len(exact_i_probe_ar) == 0:
+            break
+        exact_ave_ar, exact_max_ar = \
+            scoreProbeWordIndexArs(remaining_word_index_ar, probe_word_index_ar[exact_i_probe_ar])
+        ave_remaining_words_ar[exact_i_probe_ar] = exact_ave_ar
+        max_remaining_words_ar[exact_i_probe_ar] = exact_max_ar
+        ave_error_ar[exact_i_probe_ar] = 0
+        max_error_ar[exact_i_probe_ar] = 0
+        scored_p_ar[exact_i_probe_ar] = True
+        leader_ave = ave_remaining_words_ar[exact_p_ar].min()
+        exact_p_ar |= lower_bound_ar <= leader_ave
+    return ave_remaining_words_ar, max_remaining_words_ar, ave_error_ar, max_error_ar, exact_p_ar
+
+
+#Process pool used by scoreProbeWordIndexArsInProcessPool().  It is kept between calls
+#so that batch jobs that score many times, like precomputeResponsesToFirstProbe(),
+#start the worker processes only once.
+try:
+    gl_score_process_pool
+except:
+    gl_score_process_pool = None
+    gl_score_process_pool_size = 0
+
+#Shards smaller than this are not worth sending to another process.
+gl_min_probe_words_per_shard = 256
+
+
+#Runs in each worker process when it starts.  The worker maps the mark table from its file,
+#so the table is shared through the page cache rather than pickled to every task.
+def initScoreProcessPoolWorker(mark_ar_filename):
+    global gl_probe_answer_word_mark_ar
+    gl_probe_answer_word_mark_ar = readProbeAnswerWordMarkArFromFile(mark_ar_filename)
+
+
+#Returns gl_score_process_pool, starting it with num_processes workers if it is not
+#running with that many already.  The mark table file is written first if there is none.
+def getScoreProcessPool(num_processes):
+    global gl_score_process_pool
+    global gl_score_process_pool_size
+    if gl_score_process_pool != None and gl_score_process_pool_size == num_processes:
+        return gl_score_process_pool
+    shutdownScoreProcessPool()
+    loadProbeAnswerWordMarkAr()
+    gl_score_process_pool = \
+        concurrent.futures.ProcessPoolExecutor(max_workers=num_processes,
+                                               initializer=initScoreProcessPoolWorker,
+                                               initargs=(gl_probe_answer_word_mark_ar_filename,))
+    gl_score_process_pool_size = num_processes
+    return gl_score_process_pool
+
+
+def shutdownScoreProcessPool():
+    global gl_score_process_pool
+    global gl_score_process_pool_size
+    if gl_score_process_pool != None:
+        gl_score_process_pool.shutdown()
+    gl_score_process_pool = None
+    gl_score_process_pool_size = 0
+
+
+#This is scoreProbeWordIndexArs() with probe_word_index_ar split into up to num_processes
+#shards that are scored in gl_score_process_pool.  Only the index arrays and the score
+#arrays pass between processes.  The shard scores are concatenated back in order.
+def scoreProbeWordIndexArsInProcessPool(remaining_word_index_ar, probe_word_index_ar, num_processes):
+    num_shards = min(num_processes, len(probe_word_index_ar) // gl_min_probe_words_per_shard)
+    if num_shards <= 1:
+        return scoreProbeWordIndexArs(remaining_word_index_ar, probe_word_index_ar)
+    pool = getScoreProcessPool(num_processes)
+    shard_index_ar_list = np.array_split(probe_word_index_ar, num_shards)
+    shard_score_ars_list = list(pool.map(scoreProbeWordIndexArs,
+                                         [remaining_word_index_ar] * num_shards, shard_index_ar_list))
+    return tuple([np.concatenate([shard_score_ars[i] for shard_score_ars in shard_score_ars_list])
+                  for i in range(2)])
+
+
+#Returns a numpy array of the index of each word of word_list in word_index_dict,
+#or None if some word is not in word_index_dict.
+def makeWordIndexAr(word_list, word_index_dict):
+    index_list = []
+    for word in word_list:
+        i_word = word_index_dict.get(word)
+        if i_word == None:
+            return None
+        index_list.append(i_word)
+    return np.array(index_list, dtype=np.intp)
+
 
 #This emulates what the Wordle game does when you enter a probe word.
 #This is my second updated version that tries to match the actual wordle game
@@ -450,45 +1083,76 @@ gl_counted_already_p = [False] * 5
 #  probe_word      E R R O R
 #Actual wordle     l y r r y   There is no R (probe char) in the answer word other
 #                              than the one already marked correctly.
-#returns a list length 5 in the range {'r', 'l', 'y'}
-#returns a list length 5 in the range {'r', 'l', 'y'}
+#returns the mark index, an int 0-242, of the 5 responses in the range {'r', 'l', 'y'}
 #this version works correctly on the example provided by
 #http://sonorouschocolate.com/notes/index.php?title=The_best_strategies_for_Wordle
 # answer_word:     H O T E L
 # probe_word:      S I L L Y
 # should be        y y l y y
+#All scratch state is local, so this can be called from several threads at once.
 #def markProbeWordAgainstCorrectWord_correct_but_breaks_program(probe_word, correct_word):
 def markProbeWordAgainstCorrectWord(probe_word, correct_word):
-    char_response_list = []
-    for i in range(5):
-        gl_counted_already_p[i] = False
-    #first build a char_response_list marking correct chars green vs the rest gray
+    mark_digits = [2, 2, 2, 2, 2]   #mark digits 'r' = 0, 'l' = 1, 'y' = 2
+    counted_already_p = [False, False, False, False, False]
+    #first mark correct chars green vs the rest gray
     for i in range(5):
-        probe_char_i = probe_word[i]
-        if correct_word[i] == probe_char_i:
-            char_response_list.append('r')
-            gl_counted_already_p[i] = True
-        else:
-            char_response_list.append('y')
+        if correct_word[i] == probe_word[i]:
+            mark_digits[i] = 0
+            counted_already_p[i] = True
 
     #now take another pass switching to response char to yellow if the
     #probe char occurs in another column that has not been counted already
     for i_pos in range(5):
-        if char_response_list[i_pos] == 'r':
+        if mark_digits[i_pos] == 0:
             continue
         probe_char_i = probe_word[i_pos]
         #look for a match to probe_char_i elsewhere in the word...
         for i_word in range(5):
             if i_word == i_pos:
                 continue
-            if gl_counted_already_p[i_word] == True:
+            if counted_already_p[i_word] == True:
                 continue
             if probe_char_i == correct_word[i_word]:
                 #found a match in correct_word to this probe char not counted yet as a yellow
-                char_response_list[i_pos] = 'l'
+                mark_digits[i_pos] = 1
                 #it is now accounted for by a yellow
-                gl_counted_already_p[i_word] = True
-    return char_response_list
+                counted_already_p[i_word] = True
+    return mark_digits[0] * 81 + mark_digits[1] * 27 + mark_digits[2] * 9 + mark_digits[3] * 3 + \
+        mark_digits[4]
+
+
+#This is the batch form of markProbeWordAgainstCorrectWord().  It marks probe_word against
+#every word in answer_word_list in one call, using markProbeWordsAgainstAnswerWordsAr().
+#Returns a numpy array [len(answer_word_list)] of uint8 mark index.
+#Like markProbeWordAgainstCorrectWord(), this has no shared scratch state.
+def markProbeWordAgainstAnswerWords(probe_word, answer_word_list):
+    if len(answer_word_list) == 0:
+        return np.zeros(0, dtype=np.uint8)
+    return markProbeWordsAgainstAnswerWordsAr(makeWordLetterAr([probe_word]),
+                                              makeWordLetterAr(answer_word_list))[0]
+
+
+#Converts a char response, a string or list of 5 chars in {'r', 'l', 'y'}, like 'ylyyr'
+#or ['y', 'l', 'y', 'y', 'r'], to its mark index.
+def charResponseToMarkIndex(char_response):
+    mark_index = 0
+    for response_char in char_response:
+        mark_index = mark_index * 3 + gl_mark_digit_dict[response_char]
+    return mark_index
+
+
+#Converts a mark index to its char response string, like 'ylyyr'.
+#A mark index that is not 0-242 means the mark is not known, and comes out as 'xxxxx'.
+def markIndexToCharResponse(mark_index):
+    if mark_index < 0 or mark_index > 242:
+        return 'xxxxx'
+    char_response = ''
+    for weight in gl_mark_digit_weights:
+        char_response += gl_mark_digit_chars[(mark_index // weight) % 3]
+    return char_response
+
+#char response string for each mark index, for functions that look at the individual cues
+gl_mark_index_char_responses = tuple([markIndexToCharResponse(i) for i in range(243)])
 
 
 
@@ -512,40 +1176,109 @@ def makeCharConstraintList():
 #words from word_list.
 #This is the revised version that takes advantage of the fact that the required_char
 #list means that a character must occur somewhere where it is not already correct.
+#The constraints are first compiled to bitmasks, see compileCharConstraintList().
+#Long word lists are filtered all at once as arrays of letter bits, and
+#gl_probe_word_list and gl_answer_word_list have their letter bits precomputed.
 #Returns a list of allowable words.
 def pruneWordsPerCharConstraints(word_list, char_constraint_list):
+    compiled_ccl = compileCharConstraintList(char_constraint_list)
+    if word_list is gl_probe_word_list:
+        letter_bit_ar = gl_probe_word_letter_bit_ar
+    elif word_list is gl_answer_word_list:
+        letter_bit_ar = gl_answer_word_letter_bit_ar
+    elif len(word_list) >= gl_compiled_filter_min_len:
+        letter_bit_ar = makeWordLetterBitAr(word_list)
+    else:
+        letter_bit_ar = None
+    if letter_bit_ar is not None:
+        ok_p_ar = filterWordLetterBitArPerCharConstraints(letter_bit_ar, compiled_ccl)
+        return [word_list[i_word] for i_word in np.flatnonzero(ok_p_ar)]
+
+    pos_masks = compiled_ccl[0:5]
+    required_mask = compiled_ccl[5]
+    placement_masks = makeRequiredPlacementMasks(compiled_ccl)
     ok_words = []
     for word in word_list:
         ok_p = True
-        #check if the word's chars are allowed by the char_constraint_list
+        placed_mask = 0
         for i in range(5):
-            char_i = word[i]
-            if char_i not in char_constraint_list[i]:
+            char_bit = gl_char_bit_dict[word[i]]
+            #check if the word's chars are allowed by the char_constraint_list
+            if char_bit & pos_masks[i] == 0:
                 ok_p = False
                 break
-        if not ok_p:
-            continue
+            placed_mask |= char_bit & placement_masks[i]
         #make sure the word has any required characters looking for a placement
-        any_char_seeking_replacement_p = False
-        for required_char in char_constraint_list[5]:
-            seeking_placement_p = True
-            for i in range(5):
-                #if this is the only char allowed at this word pos, then
-                #it is already placed correctly
-                if len(char_constraint_list[i]) == 1 and \
-                   required_char in char_constraint_list[i]:
-                    continue
-                if word[i] == required_char:
-                    seeking_placement_p = False
-                    break
-            if seeking_placement_p:
-                any_char_seeking_replacement_p = True
-                break
-        if not any_char_seeking_replacement_p:
+        if ok_p and placed_mask == required_mask:
             ok_words.append(word)
     return ok_words
 
 
+#bit for each char in a 26 bit char mask, 'a' is bit 0
+gl_char_bit_dict = {}
+for i_char in range(len(gl_char_set)):
+    gl_char_bit_dict[gl_char_set[i_char]] = 1 << i_char
+
+#Word lists at least this long are filtered as arrays by pruneWordsPerCharConstraints()
+gl_compiled_filter_min_len = 100
+
+
+#Compiles char_constraint_list to a tuple of 6 int char masks, with bit i set for
+#char gl_char_set[i]:
+#  elements 0 thru 4 are the masks of allowed chars in each char position
+#  element 5 is the mask of required chars that must appear somewhere
+#A char constraint state is already in this form, so it is returned as is.
+def compileCharConstraintList(char_constraint_list):
+    if isinstance(char_constraint_list, tuple):
+        return char_constraint_list
+    compiled_ccl = []
+    for char_set in char_constraint_list:
+        char_mask = 0
+        for char in char_set:
+            char_mask |= gl_char_bit_dict[char]
+        compiled_ccl.append(char_mask)
+    return tuple(compiled_ccl)
+
+
+#A required char has found a placement when it occurs at a position that is not
+#already known to be that char.
+#Returns a tuple of 5 masks, one per char position, of the required chars that
+#would be placed by appearing at that position.
+def makeRequiredPlacementMasks(compiled_ccl):
+    required_mask = compiled_ccl[5]
+    placement_masks = []
+    for i in range(5):
+        pos_mask = compiled_ccl[i]
+        if pos_mask & (pos_mask - 1) == 0:      #only one char allowed, so it is known
+            placement_masks.append(required_mask & ~pos_mask)
+        else:
+            placement_masks.append(required_mask)
+    return tuple(placement_masks)
+
+
+#Converts a list of 5-letter words to a numpy array [len(word_list), 5] of uint32
+#with the bit for each letter in each position, as in gl_char_bit_dict.
+def makeWordLetterBitAr(word_list):
+    return np.left_shift(np.uint32(1), makeWordLetterAr(word_list).astype(np.uint32))
+
+
+#This is the array version of the filter in pruneWordsPerCharConstraints().
+#letter_bit_ar is a numpy array [n, 5] from makeWordLetterBitAr(), and
+#compiled_ccl is from compileCharConstraintList().
+#Returns a numpy array [n] of bool, True for words that meet the constraints.
+def filterWordLetterBitArPerCharConstraints(letter_bit_ar, compiled_ccl):
+    required_mask = compiled_ccl[5]
+    placement_masks = makeRequiredPlacementMasks(compiled_ccl)
+    ok_p_ar = (letter_bit_ar[:, 0] & np.uint32(compiled_ccl[0])) != 0
+    placed_mask_ar = letter_bit_ar[:, 0] & np.uint32(placement_masks[0])
+    for i in range(1, 5):
+        ok_p_ar &= (letter_bit_ar[:, i] & np.uint32(compiled_ccl[i])) != 0
+        placed_mask_ar |= letter_bit_ar[:, i] & np.uint32(placement_masks[i])
+    if required_mask != 0:
+        ok_p_ar &= placed_mask_ar == np.uint32(required_mask)
+    return ok_p_ar
+
+
 #This function returns a new char_constraint_list that updates the char_constraint_list
 #passed according to the char_responses in cue_list.
 #
@@ -553,8 +1286,7 @@ def pruneWordsPerCharConstraints(word_list, char_constraint_list):
 #The first 5 elements are char positions, for chars allowed in that position.
 #The 6th is a set of chars that the word must have in a column that is not
 #correct yet.  These are characters looking for a position.
-#cue_list a list of two entries:   [probe_word, char_response_list]
-#where char_response_list is a list of 5 strings like   ['y', 'y', 'l', 'r', 'l']
+#cue_list a list of two entries:   [probe_word, mark_index]
 #
 #This revision takes into account that a response char is yellow l only if the
 #probe char occurs elsewhere in the word *in an incorrect position*.
@@ -562,10 +1294,14 @@ def pruneWordsPerCharConstraints(word_list, char_constraint_list):
 #tiles as yellow and gray are a bit subtle.  I am not 100% sure this is correct,
 #but I have stopped finding failure cases after about 50 trials.
 #Does not modify char_constraint_list.
+#If char_constraint_list is a char constraint state, this returns the new char constraint
+#state from updateCharConstraintState().
 def updateCharConstraintList(cue_list, char_constraint_list):
+    if isinstance(char_constraint_list, tuple):
+        return updateCharConstraintState(char_constraint_list, cue_list[0], cue_list[1])
     new_char_constraint_list = [ set(pos_chrs) for pos_chrs in char_constraint_list ]
     probe_word = cue_list[0]
-    char_response_list = cue_list[1]
+    char_response_list = gl_mark_index_char_responses[cue_list[1]]  #string like 'yylrl'
     chars_to_consider = {}  #key = char
                             #value: count of char occurrences
     for i_pos in range(5):
@@ -635,6 +1371,108 @@ def updateCharConstraintList(cue_list, char_constraint_list):
     return new_char_constraint_list
 
 
+#A char constraint state is the immutable, hashable form of a char_constraint_list:
+#a tuple of 6 int char masks as made by compileCharConstraintList(), with bit i set for
+#char gl_char_set[i].
+#  elements 0 thru 4 are the masks of allowed chars in each char position
+#  element 5 is the mask of required chars that must appear somewhere
+#A char constraint state can be passed anywhere that takes a char_constraint_list.
+#Updating a state per a cue is looked up in a cache, see updateCharConstraintState().
+gl_all_chars_mask = (1 << len(gl_char_set)) - 1
+
+def makeCharConstraintState():
+    return (gl_all_chars_mask, gl_all_chars_mask, gl_all_chars_mask, gl_all_chars_mask,
+            gl_all_chars_mask, 0)
+
+gl_initial_char_constraint_state = makeCharConstraintState()
+
+
+#Converts a char constraint state back to a char_constraint_list of sets of char.
+def charConstraintStateToList(char_constraint_state):
+    char_constraint_list = []
+    for char_mask in char_constraint_state:
+        char_constraint_list.append(set([char for char in gl_char_set
+                                         if char_mask & gl_char_bit_dict[char]]))
+    return char_constraint_list
+
+
+#True if char_mask allows exactly one char, i.e. the char at that position is known
+def isSingleCharMask(char_mask):
+    return char_mask != 0 and char_mask & (char_mask - 1) == 0
+
+
+#The number of (state, probe word, mark) transitions kept by updateCharConstraintState()
+gl_char_constraint_state_cache_size = 1 << 18
+
+
+#This is updateCharConstraintList() for a char constraint state.  It applies the same
+#rules to the char masks, and returns the new char constraint state.
+#The result depends only on the arguments, so the most recently used transitions are cached,
+#and applying the same cue to the same state again is one lookup.
+@functools.lru_cache(maxsize = gl_char_constraint_state_cache_size)
+def updateCharConstraintState(char_constraint_state, probe_word, mark_index):
+    new_char_constraint_state = list(char_constraint_state)
+    char_response_list = gl_mark_index_char_responses[mark_index]  #string like 'yylrl'
+    for i_pos in range(5):
+        probe_char = probe_word[i_pos]
+        probe_char_bit = gl_char_bit_dict[probe_char]
+        char_response = char_response_list[i_pos]
+        if char_response == 'y':        #gray - remove probe_char entirely from this position
+            new_char_constraint_state[i_pos] &= ~probe_char_bit
+            #if probe_char appears elsewhere as yellow, then we cannot be safe in eliminating
+            #it from other positions
+            char_appears_elsewhere_y_p = False
+            for i_pos2 in range(5):
+                if probe_word[i_pos2] == probe_char and char_response_list[i_pos2] == 'l':
+                    char_appears_elsewhere_y_p = True
+                    break
+            if not char_appears_elsewhere_y_p:
+                for i_pos2 in range(5):
+                    #don't much with a position if it is known
+                    if isSingleCharMask(new_char_constraint_state[i_pos2]):
+                        continue
+                    new_char_constraint_state[i_pos2] &= ~probe_char_bit
+
+        elif char_response == 'l':      #yellow - remove probe_char only from i_pos chars
+            new_char_constraint_state[i_pos] &= ~probe_char_bit
+            #Add to the required set only if not accounted for by a known char elsewhere
+            #that is not at that position in the probe word.
+            make_required_p = True
+            for i_pos2 in range(5):
+                if i_pos2 == i_pos:
+                    continue
+                char_mask_ipos2 = char_constraint_state[i_pos2]
+                if isSingleCharMask(char_mask_ipos2) and char_mask_ipos2 & probe_char_bit:
+                    if probe_word[i_pos2] != probe_char:
+                        make_required_p = False
+            if make_required_p:
+                new_char_constraint_state[5] |= probe_char_bit
+
+        elif char_response == 'r':      #green - only probe_char allowed in i_pos chars
+            new_char_constraint_state[i_pos] = probe_char_bit
+            #Remove from the required set unless the char also appears with a yellow response.
+            if new_char_constraint_state[5] & probe_char_bit:
+                ok_to_remove_p = True
+                for i_pos2 in range(5):
+                    if i_pos2 == i_pos:
+                        continue
+                    if char_response_list[i_pos2] != 'l':
+                        continue
+                    if probe_word[i_pos2] == probe_char:
+                        ok_to_remove_p = False
+                if ok_to_remove_p:
+                    new_char_constraint_state[5] &= ~probe_char_bit
+    return tuple(new_char_constraint_state)
+
+
+#Returns the char constraint state after applying each cue_list in cue_list_list in turn.
+def makeCharConstraintStateForCues(cue_list_list):
+    char_constraint_state = gl_initial_char_constraint_state
+    for cue_list in cue_list_list:
+        char_constraint_state = updateCharConstraintState(char_constraint_state, cue_list[0], cue_list[1])
+    return char_constraint_state
+
+
 
 
 #This is recursive on words in word_list so cannot be used with a very long word list.
@@ -644,14 +1482,27 @@ def updateCharConstraintList(cue_list, char_constraint_list):
 #recommended word than other presented to them. However, at this stage, usually
 #most or all of the words have approximately the same word count score, so this
 #approximation of expected moves is probably pretty close.
+#When the words are answer words, the recursion is memoized on the word sets it reaches,
+#see figureExpectedMovesForAnswer(), so word lists of up to gl_expected_moves_max_words_len
+#words are affordable.
 def countExpectedMovesToAnswer(probe_word, hypothetical_correct_word, word_list,
                                move_count = 1, indent = ''):
+    i_probe_word = gl_probe_word_index_dict.get(probe_word)
+    i_correct_word = gl_answer_word_index_dict.get(hypothetical_correct_word)
+    word_set = makeWordSet(word_list)
+    if i_probe_word != None and i_correct_word != None and word_set != None:
+        if probe_word == hypothetical_correct_word:
+            return move_count
+        mark_index = int(getProbeAnswerWordMarkRows([i_probe_word])[i_probe_word, i_correct_word])
+        reduced_word_set = word_set & getProbeMarkAnswerWordSet(i_probe_word, mark_index)
+        return move_count + 1 + figureExpectedMovesForAnswer(reduced_word_set, i_correct_word)
+
     #indent and print statements are left over from development, and for entertainment
     #for later developers.
     #print(indent + 'counting expected moves for probe word: ' + probe_word + '  hyp_correct_word: ' + hypothetical_correct_word + '  word_list:' + str(word_list) + ' move_count: ' + str(move_count))
 
     probe_response = markProbeWordAgainstCorrectWord(probe_word, hypothetical_correct_word)
-    if probe_response == gl_correct_response:
+    if probe_response == gl_correct_mark_index:
         #print(indent + '***probe_word: ' + probe_word + ' matches correct word, returning move_count: ' + str(move_count))
         return move_count
     move_count += 1
@@ -665,9 +1516,126 @@ def countExpectedMovesToAnswer(probe_word, hypothetical_correct_word, word_list,
                                                     reduced_word_list, move_count, indent + '   ')
     return expect
 
+
+#Expected moves are memoized on WordSet bits in these caches, which are kept across calls
+#for the session, and cleared at the start of each runGame().  They are also cleared when either
+#grows past gl_expected_moves_cache_max_len entries.  A key's bits take up to about 300 bytes,
+#so with dict and float overhead that is some tens of MB each.
+#gl_expected_moves_for_answer_cache  key: (bits, i_correct_word)   value: U(S, h) below
+#gl_expected_moves_sum_cache         key: bits                     value: A(S) below
+try:
+    gl_expected_moves_sum_cache
+except:
+    gl_expected_moves_sum_cache = {}
+    gl_expected_moves_for_answer_cache = {}
+
+gl_expected_moves_cache_max_len = 1 << 16
+
+#The most remaining words that expected moves are computed for in probe word scores.
+gl_expected_moves_max_words_len = 100
+
+
+def clearExpectedMovesCaches():
+    gl_expected_moves_sum_cache.clear()
+    gl_expected_moves_for_answer_cache.clear()
+
+
+#U(S, h), the expected number of further moves to reach the answer word h, at index
+#i_correct_word in gl_answer_word_list, when it is in word_set S and each next probe word is
+#picked uniformly from S.  Probing q != h leaves S_q(h), the words of S that get the same mark
+#from q as h does, so
+#   U(S, h) = (1/|S|) * sum over q in S, q != h, of (1 + U(S_q(h), h))
+#This is countExpectedMovesToAnswer() without move_count.
+def figureExpectedMovesForAnswer(word_set, i_correct_word):
+    if len(word_set) <= 1:
+        return 0.0
+    key = (word_set.bits, i_correct_word)
+    expected_moves = gl_expected_moves_for_answer_cache.get(key)
+    if expected_moves != None:
+        return expected_moves
+    index_list = word_set.indexList()
+    probe_word_index_ar = gl_answer_word_probe_index_ar[index_list]
+    mark_list = getProbeAnswerWordMarkRows(probe_word_index_ar)[probe_word_index_ar, i_correct_word].tolist()
+    moves_sum = 0
+    for i_probe_word, mark_index in zip(probe_word_index_ar.tolist(), mark_list):
+        if mark_index == gl_correct_mark_index:
+            continue
+        reduced_word_set = word_set & getProbeMarkAnswerWordSet(i_probe_word, mark_index)
+        moves_sum += 1 + figureExpectedMovesForAnswer(reduced_word_set, i_correct_word)
+    expected_moves = moves_sum / len(index_list)
+    if len(gl_expected_moves_for_answer_cache) >= gl_expected_moves_cache_max_len:
+        gl_expected_moves_for_answer_cache.clear()
+    gl_expected_moves_for_answer_cache[key] = expected_moves
+    return expected_moves
+
+
+#A(S), the sum over every word h in word_set S of U(S, h), figureExpectedMovesForAnswer().
+#Summing U over h groups the words h by the bucket B that the next probe word q puts them in,
+#and the words of one bucket are just the words h with S_q(h) = B, so
+#   A(S) = (|S| - 1) + (1/|S|) * sum over q in S of the sum over q's buckets B != {q} of A(B)
+#Only set partitions are needed, not one recursion per answer word.
+def figureExpectedMovesSum(word_set):
+    num_words = len(word_set)
+    if num_words <= 1:
+        return 0.0
+    moves_sum = gl_expected_moves_sum_cache.get(word_set.bits)
+    if moves_sum != None:
+        return moves_sum
+    index_list = word_set.indexList()
+    probe_word_index_ar = gl_answer_word_probe_index_ar[index_list]
+    mark_ar = getProbeAnswerWordMarkRows(probe_word_index_ar)[np.ix_(probe_word_index_ar, index_list)]
+    bucket_sum = 0
+    for i_probe_word, mark_list in zip(probe_word_index_ar.tolist(), mark_ar.tolist()):
+        bucket_sum += sumExpectedMovesOverBuckets(word_set, i_probe_word, mark_list)
+    moves_sum = (num_words - 1) + bucket_sum / num_words
+    if len(gl_expected_moves_sum_cache) >= gl_expected_moves_cache_max_len:
+        gl_expected_moves_sum_cache.clear()
+    gl_expected_moves_sum_cache[word_set.bits] = moves_sum
+    return moves_sum
+
+
+#mark_list is the marks that the words of word_set get from the probe word at i_probe_word.
+#Returns the sum of figureExpectedMovesSum() over the buckets, except the correct one.
+#Buckets of one word add nothing, so they are not built.
+def sumExpectedMovesOverBuckets(word_set, i_probe_word, mark_list):
+    mark_count_dict = {}
+    for mark_index in mark_list:
+        mark_count_dict[mark_index] = mark_count_dict.get(mark_index, 0) + 1
+    bucket_sum = 0
+    for mark_index, count in mark_count_dict.items():
+        if count > 1 and mark_index != gl_correct_mark_index:
+            bucket_sum += figureExpectedMovesSum(word_set & getProbeMarkAnswerWordSet(i_probe_word, mark_index))
+    return bucket_sum
+
+
+#Returns the expected moves to answer of probe_word, a word of word_set, averaged over every
+#word of word_set as the answer.  That is the probe itself when it is the answer, and otherwise
+#the probe, one more move, and U of the bucket the answer is in, so summing over the answers,
+#   (1 + 2 * (|S| - 1) + sum over probe_word's buckets B != {probe_word} of A(B)) / |S|
+#Returns None if the words are not answer words.
+def figureExpectedMovesToAnswer(probe_word, word_set):
+    i_answer_word = gl_answer_word_index_dict.get(probe_word)
+    word_set = makeWordSet(word_set)
+    if i_answer_word == None or word_set == None or probe_word not in word_set:
+        return None
+    i_probe_word = int(gl_answer_word_probe_index_ar[i_answer_word])
+    mark_list = getProbeAnswerWordMarkRows([i_probe_word])[i_probe_word, word_set.indexAr()].tolist()
+    num_words = len(word_set)
+    return (1 + 2 * (num_words - 1) + sumExpectedMovesOverBuckets(word_set, i_probe_word, mark_list)) / num_words
+
 gl_data_dirpath = path.join('..', 'data')
 
 
+#Returns the path to filename in either the current dir or the ../data/ dir, or None.
+def findDataFilepath(filename):
+    if path.exists(filename):
+        return filename
+    filepath = path.join(gl_data_dirpath, filename)
+    if path.exists(filepath):
+        return filepath
+    return None
+
+
 def importWordList(word_filename = None):
     if word_filename == None:
         word_filename = gl_word_filename
@@ -715,6 +1683,111 @@ def makeAnswerWordIndexDict():
 
 makeAnswerWordIndexDict()
 
+#The index in gl_probe_word_list of each answer word, which is also a probe word.
+gl_answer_word_probe_index_ar = np.array([gl_probe_word_index_dict[word] for word in gl_answer_word_list],
+                                         dtype=np.intp)
+
+
+#A WordSet is a set of answer words held as a bitset over gl_answer_word_list:  bit i
+#of the python int self.bits is set when gl_answer_word_list[i] is in the set.
+#Intersection, union, and difference are one int operation, len() is a population count,
+#and a WordSet can be hashed, so it can key a cache directly.
+#Iterating a WordSet gives its words in gl_answer_word_list order, which is sorted.
+#Words that are not answer words cannot be in a WordSet.
+class WordSet(object):
+    __slots__ = ('bits',)
+
+    def __init__(self, bits = 0):
+        self.bits = bits
+
+    def __and__(self, other):
+        return WordSet(self.bits & other.bits)
+
+    def __or__(self, other):
+        return WordSet(self.bits | other.bits)
+
+    def __sub__(self, other):
+        return WordSet(self.bits & ~other.bits)
+
+    def __len__(self):
+        return self.bits.bit_count()
+
+    def __contains__(self, word):
+        i_word = gl_answer_word_index_dict.get(word)
+        if i_word == None:
+            return False
+        return (self.bits >> i_word) & 1 == 1
+
+    def __iter__(self):
+        return iter(self.wordList())
+
+    def __eq__(self, other):
+        return isinstance(other, WordSet) and self.bits == other.bits
+
+    def __hash__(self):
+        return hash(self.bits)
+
+    def __repr__(self):
+        return 'WordSet(' + str(self.wordList()) + ')'
+
+    #Returns a numpy array of the indices in gl_answer_word_list of the words in the set,
+    #in increasing order.
+    def indexAr(self):
+        return bitsToIndexAr(self.bits, len(gl_answer_word_list))
+
+    #Returns a list of the indices of the words in the set, in increasing order.
+    #Small sets, which are most of the sets in a search, are quicker to walk bit by bit.
+    def indexList(self):
+        if len(self) > gl_word_set_walk_bits_len:
+            return self.indexAr().tolist()
+        index_list = []
+        bits = self.bits
+        while bits:
+            low_bit = bits & -bits
+            index_list.append(low_bit.bit_length() - 1)
+            bits ^= low_bit
+        return index_list
+
+    def wordList(self):
+        return [gl_answer_word_list[i_word] for i_word in self.indexList()]
+
+
+gl_word_set_walk_bits_len = 64
+
+
+#Returns a numpy array of the indices of the bits set in the python int bits, which has
+#at most num_bits bits, in increasing order.
+def bitsToIndexAr(bits, num_bits):
+    bits_ar = np.frombuffer(bits.to_bytes((num_bits + 7) // 8, 'little'), dtype=np.uint8)
+    return np.flatnonzero(np.unpackbits(bits_ar, bitorder='little'))
+
+
+#Returns a python int with the bits at the indices in index_ar set, where the
+#indices are less than num_bits.
+def indexArToBits(index_ar, num_bits):
+    bool_ar = np.zeros((num_bits + 7) // 8 * 8, dtype=np.uint8)
+    bool_ar[index_ar] = 1
+    return int.from_bytes(np.packbits(bool_ar, bitorder='little').tobytes(), 'little')
+
+
+#Returns a WordSet of the words in word_list, or None if some word is not an answer word.
+#A WordSet passed in is returned as is.
+def makeWordSet(word_list):
+    if isinstance(word_list, WordSet):
+        return word_list
+    bits = 0
+    for word in word_list:
+        i_word = gl_answer_word_index_dict.get(word)
+        if i_word == None:
+            return None
+        bits |= 1 << i_word
+    return WordSet(bits)
+
+
+#Returns a WordSet of the answer words at the indices in word_index_ar.
+def makeWordSetFromIndexAr(word_index_ar):
+    return WordSet(indexArToBits(word_index_ar, len(gl_answer_word_list)))
+
 
 #
 #
@@ -758,20 +1831,21 @@ def getScoreForWord(score_list, word):
 #a utility for development and debugging
 #enter a probe word and wordle response as a string, like
 #>>> cl_raise = aw.makeCueListForResponse('raise', 'ylyyl')
-#Returns a cue_list of the form ['raise', ['y', 'l', 'y', 'y', 'l']]
+#Returns a cue_list of the form ['raise', 214], where 214 is the mark index of 'ylyyl'
 def makeCueListForResponse(probe_word, str_response):
     if len(probe_word) != 5 or len(str_response) != 5:
         print('probe and str_response need to be len 5')
         return
-    response_list = []
-    for i in range(5):
-        response_list.append(str_response[i])
-    return [probe_word, response_list]
+    for response_char in str_response:
+        if response_char not in gl_mark_digit_dict:
+            print('response characters must be one of r = green, l = yellow, y = gray')
+            return
+    return [probe_word, charResponseToMarkIndex(str_response)]
 
 #a utility for development and debugging
-#enter a probe word and wordle response as a string, like
-#>>> cl_raise = aw.makeCueListForResponse('raise', 'ylyyl')
-#Returns a cue_list of the form ['raise', ['y', 'l', 'y', 'y', 'l']]
+#enter a probe word and the answer word, like
+#>>> cl_raise = aw.makeCueListForResponseAgainstCorrectWord('raise', 'sweat')
+#Returns a cue_list of the form ['raise', 214], the mark index the game would respond with
 def makeCueListForResponseAgainstCorrectWord(probe_word, correct_word):
     mark = markProbeWordAgainstCorrectWord(probe_word, correct_word)
     return [probe_word, mark]
@@ -785,7 +1859,7 @@ def composeCCL(cue_list_list):
     ccl_init = makeCharConstraintList()
     ccl_next = ccl_init
     for cue_list in cue_list_list:
-        print('\n applying cue_list: ' + str(cue_list))
+        print('\n applying cue_list: ' + str([cue_list[0], markIndexToCharResponse(cue_list[1])]))
         ccl_next = updateCharConstraintList(cue_list, ccl_next)
         printCharConstraintList(ccl_next)
     return ccl_next
@@ -793,7 +1867,10 @@ def composeCCL(cue_list_list):
 #char_constraint_list is a list of list
 #  list[0]-list[4]  are sets of allowed characters in each char position
 #  list[5] is a set of characters that must appear somewhere
+#or a char constraint state.
 def printCharConstraintList(char_constraint_list):
+    if isinstance(char_constraint_list, tuple):
+        char_constraint_list = charConstraintStateToList(char_constraint_list)
     for i in range(5):
         listified = list(char_constraint_list[i])
         listified.sort()
@@ -825,9 +1902,11 @@ def runGame(hard_mode_p = False, initial_probe_word = None):
     if hard_mode_p in ('h', 'help', 'args', '?'):
         printHelp()
 
-    remaining_word_list = gl_answer_word_list
+    clearExpectedMovesCaches()    #memos from a previous game are unlikely to be hit again
+    remaining_word_set = makeWordSet(gl_answer_word_list)
     probe_word_list = gl_probe_word_list
-    char_constraint_list = makeCharConstraintList()
+    char_constraint_list = makeCharConstraintState()
+    cue_list_list = []    #the cues so far, for qualifying probe words in hard mode
     probe_word_scores_remaining_words = None #initialize
 
     #allow user input of initial probe word from the input/response loop
@@ -852,10 +1931,15 @@ def runGame(hard_mode_p = False, initial_probe_word = None):
         if char_response == 'exit':
             return
         printFullColorCharResponse(char_response)
-        cue_list = [probe_word, char_response]
-        remaining_word_list, char_constraint_list = \
-                pruneWordsPerProbeResponse(remaining_word_list, cue_list, char_constraint_list)
-        gl_last_ccl = char_constraint_list  #development and debugging
+        mark_index = charResponseToMarkIndex(char_response)
+        cue_list = [probe_word, mark_index]
+        remaining_word_set = pruneWordSetPerProbeResponse(remaining_word_set, cue_list)
+        remaining_word_list = remaining_word_set.wordList()
+        #char constraints are needed only to qualify probe words in hard mode
+        if hard_mode_p:
+            char_constraint_list = updateCharConstraintList(cue_list, char_constraint_list)
+            cue_list_list.append(cue_list)
+            gl_last_ccl = char_constraint_list  #development and debugging
         print('words_remaining: ' + str(len(remaining_word_list)))
         if len(remaining_word_list) == 0:
             print('no answer words remaining')
@@ -886,12 +1970,12 @@ def runGame(hard_mode_p = False, initial_probe_word = None):
             if use_dict_p:
                 print('...looking up scores from dict (hard mode)')
                 probe_word_scores = \
-                    gl_precomputed_first_probe_word_dict_raise_hard_mode.get(tuple(char_response))
+                    gl_precomputed_first_probe_word_dict_raise_hard_mode.get(mark_index)
             else:
-                if len(remaining_word_list) > 100:
-                    print('many possible answer words to consider so this could take several minutes... ')
                 probe_word_scores = scoreProbeWords(remaining_word_list, probe_word_list,
-                                                    score_char_constraint_list, False)
+                                                    score_char_constraint_list, False,
+                                                    hard_mode_cue_list_list = cue_list_list,
+                                                    top_k = gl_run_game_top_k)
             
         #normal mode
         else:
@@ -899,12 +1983,11 @@ def runGame(hard_mode_p = False, initial_probe_word = None):
             if use_dict_p:
                 print('...looking up scores from dict (normal mode)')
                 probe_word_scores = \
-                    gl_precomputed_first_probe_word_dict_raise_normal_mode.get(tuple(char_response))
+                    gl_precomputed_first_probe_word_dict_raise_normal_mode.get(mark_index)
             else:
-                if len(remaining_word_list) > 100:
-                    print('...many possible answer words to consider so this could take several minutes... ')
                 probe_word_scores = scoreProbeWords(remaining_word_list, probe_word_list,
-                                                    score_char_constraint_list, False)
+                                                    score_char_constraint_list, False,
+                                                    top_k = gl_run_game_top_k)
 
         #report scores and recommendation
         if probe_word_scores == None:
@@ -914,27 +1997,31 @@ def runGame(hard_mode_p = False, initial_probe_word = None):
         if use_dict_p:
             print('scores from top 10 probe words:')
         else:
-            print('top 10 scores from all probe words (' + str(len(probe_word_scores)) + '):')
-        printProbeWordScores(probe_word_scores, 20)
+            print('top ' + str(len(probe_word_scores)) + ' scores from all probe words:')
+        printProbeWordScores(probe_word_scores, gl_run_game_top_k)
 
         #for investigating the program's behavior
         global gl_last_probe_word_scores
         gl_last_probe_word_scores = probe_word_scores
         #
-        if len(remaining_word_list) <= 40:
-            #there are few enough remaining words that it is worth re-scoring them which will
-            #now append expected moves"
-            probe_word_scores_remaining_words = scoreProbeWords(remaining_word_list, remaining_word_list,
-                                                                score_char_constraint_list, False)
+        #Score the remaining words as probe words.  If there are few enough, all of them are scored,
+        #which will now append expected moves.  Otherwise only the top ones are needed.
+        if hard_mode_p:
+            score_cue_list_list = cue_list_list
         else:
+            score_cue_list_list = None
+        if len(remaining_word_list) <= gl_expected_moves_max_words_len:
+            remaining_top_k = None
+        else:
+            remaining_top_k = gl_few_words_len
+        probe_word_scores_remaining_words = scoreProbeWords(remaining_word_list, remaining_word_list,
+                                                            score_char_constraint_list, False,
+                                                            hard_mode_cue_list_list = score_cue_list_list,
+                                                            top_k = remaining_top_k)
+        if probe_word_scores_remaining_words == None:
             probe_word_scores_remaining_words = []
-            remaining_word_set = set(remaining_word_list)
-            for score in probe_word_scores:
-                word = score[0]
-                if word in remaining_word_set:
-                    probe_word_scores_remaining_words.append(score)
         if len(probe_word_scores_remaining_words) > 0:
-            print('top scores from ' + str(len(probe_word_scores_remaining_words)) + ' remaining answer words:')
+            print('top scores from ' + str(len(remaining_word_list)) + ' remaining answer words:')
             printProbeWordScores(probe_word_scores_remaining_words, gl_few_words_len)
   
         #Alert the user if they have a choice to make about picking a probe word that might
@@ -1006,25 +2093,39 @@ def printProbeWordScores(probe_word_scores, num=20):
     if probe_word_scores == None or len(probe_word_scores) < 1:
         return
     has_expected_moves_p = False
-    if len(probe_word_scores[0]) > 3:
+    if len(probe_word_scores[0]) > 3 and probe_word_scores[0][3] != None:
         has_expected_moves_p = True
+    #an entropy column comes after expected moves, which is None if there are none
+    has_entropy_p = len(probe_word_scores[0]) > 4
+    if has_entropy_p:
+        entropy_header_list = ['      entropy', '       (bits)', '']
+    else:
+        entropy_header_list = ['', '', '']
 #    for score in probe_word_scores[0:20]:
 #        print(str(score))
     if has_expected_moves_p:
-        print(' probe       average       max       expected')
-        print('  word        words       words      moves to')
-        print('            remaining   remaining     answer')
+        print(' probe       average       max       expected' + entropy_header_list[0])
+        print('  word        words       words      moves to' + entropy_header_list[1])
+        print('            remaining   remaining     answer' + entropy_header_list[2])
         for score in probe_word_scores[0:num]:
-            if len(score) > 3:
-                print(' {0:8}     {1:.3f}  {2:8}         {3:.3f}'.format(score[0], score[1], score[2], score[3]))
+            if len(score) > 3 and score[3] != None:
+                score_str = ' {0:8}     {1:.3f}  {2:8}         {3:.3f}'.format(score[0], score[1], score[2], score[3])
             else:
-                print(' {0:8}     {1:.3f}  {2:8}'.format(score[0], score[1], score[2]))                
+                score_str = ' {0:8}     {1:.3f}  {2:8}'.format(score[0], score[1], score[2])
+                if has_entropy_p:
+                    score_str += '              '
+            if has_entropy_p:
+                score_str += '        {0:.3f}'.format(score[4])
+            print(score_str)
     else:
-        print(' probe       average       max')
-        print('  word        words       words')
-        print('            remaining   remaining')
+        print(' probe       average       max' + entropy_header_list[0])
+        print('  word        words       words' + entropy_header_list[1])
+        print('            remaining   remaining' + entropy_header_list[2])
         for score in probe_word_scores[0:num]:
-            print(' {0:8}     {1:.3f}  {2:8}'.format(score[0], score[1], score[2]))
+            score_str = ' {0:8}     {1:.3f}  {2:8}'.format(score[0], score[1], score[2])
+            if has_entropy_p:
+                score_str += '        {0:.3f}'.format(score[4])
+            print(score_str)
 
 
 
@@ -1108,38 +2209,43 @@ def printHelp():
 #For the first_probe_word passed (which defaults to gl_first_probe_word),
 #this computes the score_list for every combination of responses that the game might
 #give.  The 10 best (lowest average) probe word scores are retained in a dictionary.
-#returns a dict: key:    tuple: char_response
+#num_processes is passed along to scoreProbeWords() to score in a process pool.
+#returns a dict: key:    int: mark_index of the char_response
 #                value:  list of score: tuple: (probe_word, ave_words_remaining, max_words_remaining)
-def precomputeResponsesToFirstProbe(probe_word_list = None, first_probe_word = None, hard_mode_p = False):
+def precomputeResponsesToFirstProbe(probe_word_list = None, first_probe_word = None, hard_mode_p = False,
+                                    num_processes = 1):
     if probe_word_list == None:
         probe_word_list = gl_probe_word_list
     if first_probe_word == None:
         first_probe_word = gl_first_probe_word
-    first_probe_response_dict = {}   #key:    tuple: char_response
+    first_probe_response_dict = {}   #key:    int: mark_index
                                      #value:  list of score
-    char_response_combo_list = generateAllCharResponseCombos()
     count = 0
-    for char_response_combo in char_response_combo_list:
-        print(str(count) + '  ' + str(char_response_combo))
+    for mark_index in range(243):
+        char_response = markIndexToCharResponse(mark_index)
+        print(str(count) + '  ' + char_response)
         count += 1
-        cue_list = [first_probe_word, char_response_combo]
+        cue_list = [first_probe_word, mark_index]
         remaining_words, char_constraint_list = pruneWordsPerProbeResponse(gl_answer_word_list, cue_list)
 
         #if not many remaining_words, then use only remaining words as probes
         if len(remaining_words) < gl_few_words_len:
             if hard_mode_p:
-                score_list = scoreProbeWords(remaining_words, remaining_words, char_constraint_list)
+                score_list = scoreProbeWords(remaining_words, remaining_words, char_constraint_list,
+                                             hard_mode_cue_list_list = [cue_list])
             else:
                 score_list = scoreProbeWords(remaining_words, remaining_words, None)
         else:
             if hard_mode_p:
-                score_list = scoreProbeWords(remaining_words, probe_word_list, char_constraint_list)
+                score_list = scoreProbeWords(remaining_words, probe_word_list, char_constraint_list,
+                                             True, num_processes, [cue_list], gl_few_words_len)
             else:
-                score_list = scoreProbeWords(remaining_words, probe_word_list, None)
+                score_list = scoreProbeWords(remaining_words, probe_word_list, None,
+                                             True, num_processes, top_k = gl_few_words_len)
         if score_list == None:
             continue
-        print(str(char_response_combo) + ': ' + str(score_list[0:gl_few_words_len]))
-        first_probe_response_dict[tuple(char_response_combo)] = score_list[0:gl_few_words_len]
+        print(char_response + ': ' + str(score_list[0:gl_few_words_len]))
+        first_probe_response_dict[mark_index] = score_list[0:gl_few_words_len]
     return first_probe_response_dict
 
 
@@ -1170,9 +2276,9 @@ def writeProbeDictToFile(probe_dict, filename=None, header_str=''):
     if filename == None:
         filename = gl_precomputed_probe_dict_filename
     probe_dict2 = {}   
-    for tup_key in probe_dict:   #need to convert keys from tuple of char to a str
-        str_key = ''.join(tup_key)
-        probe_dict2[str_key] = probe_dict.get(tup_key)
+    for mark_index in probe_dict:   #need to convert keys from mark index to a char response str
+        str_key = markIndexToCharResponse(mark_index)
+        probe_dict2[str_key] = probe_dict.get(mark_index)
     with open(filename, 'w', encoding='utf-8') as file:
         output_str = ''
         output_str += '#' + header_str + '\n'
@@ -1205,11 +2311,7 @@ def readProbeDictFromFile(filename=None):
     probe_dict2 = json.loads(input_str)
     probe_dict = {}
     for str_key in probe_dict2:
-        tup_keyl = []
-        for i in range(len(str_key)):
-            tup_keyl.append(str_key[i])
-        tup_key = tuple(tup_keyl)
-        probe_dict[tup_key] = probe_dict2.get(str_key)
+        probe_dict[charResponseToMarkIndex(str_key)] = probe_dict2.get(str_key)
     print('read precomputed probe dict of size: ' + str(len(probe_dict)))
     return probe_dict
 
@@ -1311,33 +2413,36 @@ def findResultSeqForAnswerWord(answer_word, initial_probe_word = 'raise', answer
     result_seq = [initial_probe_word]
     
     mark = markProbeWordAgainstCorrectWord(initial_probe_word, answer_word)
-    if mark == gl_correct_response:
+    if mark == gl_correct_mark_index:
         return result_seq
     cue_list = [initial_probe_word, mark]
     if print_p:
         print('probe: ' + initial_probe_word + '   cue_list: ' + str(cue_list))
-    ok_words, ccl = pruneWordsPerProbeResponse(answer_word_list, cue_list)
+    answer_word_set = makeWordSet(answer_word_list)
+    if answer_word_set == None:
+        print('Problem: answer_word_list has words that are not answer words')
+        return
+    ok_words = pruneWordSetPerProbeResponse(answer_word_set, cue_list)
     if print_p:
         ok_words_str = ''
         if len(ok_words) < 8:
             ok_words_str = ' ' + str(ok_words)
-        print('ok_words: ' + str(len(ok_words)) + ok_words_str + ' ccl: ')
+        print('ok_words: ' + str(len(ok_words)) + ok_words_str)
         
     if len(ok_words) == 1:
-        if ok_words[0] == answer_word:
+        if answer_word in ok_words:
             result_seq.append(answer_word)            
             if print_p:
                 print('ok_words narrowed down to one, appending answer word to result seq: ' + str(result_seq))
             return result_seq
             
-        #printCharConstraintList(ccl)
     if initial_probe_word == 'raise':
-        scores = gl_precomputed_first_probe_word_dict_raise_normal_mode.get(tuple(mark))
+        scores = gl_precomputed_first_probe_word_dict_raise_normal_mode.get(mark)
     else:
         scores = scoreProbeWords(answer_word_list, gl_probe_word_list, None, False)
     if scores == None or len(scores) == 0:
         print('problem: answer_word: ' + answer_word + ' scores: ' + str(scores))
-        print('mark: ' + str(mark))
+        print('mark: ' + markIndexToCharResponse(mark))
         return
     #printProbeWordScores(scores, 10)
     probe_word = scores[0][0]
@@ -1355,20 +2460,18 @@ def findResultSeqForAnswerWord(answer_word, initial_probe_word = 'raise', answer
         cue_list = [probe_word, mark]
         if print_p:
             print('probe_word: ' + probe_word + '   cue_list: ' + str(cue_list))
-        ok_words, ccl = pruneWordsPerProbeResponse(ok_words, cue_list, ccl)
+        ok_words = pruneWordSetPerProbeResponse(ok_words, cue_list)
         if print_p:
             ok_words_str = ''
             if len(ok_words) < 8:
                 ok_words_str = ' ' + str(ok_words)
-                print('ok_words: ' + str(len(ok_words)) + ok_words_str + ' ccl: ')
-                #printCharConstraintList(ccl)
+                print('ok_words: ' + str(len(ok_words)) + ok_words_str)
         scores = scoreProbeWords(ok_words, gl_probe_word_list, None, False)    #normal mode
         #detect a problem
         if scores == None or len(scores) == 0:
             print('problem2 with scores: ' + str(scores))
-            print('probe_word: ' + str(probe_word) + ' mark: ' + str(mark) + ' ok_words: ' + str(len(ok_words)))
-            print('ccl: ')
-            printCharConstraintList(ccl)
+            print('probe_word: ' + str(probe_word) + ' mark: ' + markIndexToCharResponse(mark) + ' ok_words: ' + str(len(ok_words)))
+            print('ok_words: ' + str(ok_words))
             return None
         probe_word = scores[0][0]
         result_seq.append(probe_word)
@@ -1474,72 +2577,552 @@ gl_top_n = 100
 #gl_top_n_probe_words = readTopNWords(gl_top_n)
 
 
-#numpy array [12972, 2315]  of int: index of mark, -1 means not computed yet
+#numpy array [12972, 2315]  of uint8: index of mark,
+#gl_mark_index_not_computed means not computed yet
 
 # 12972 x 2315 lookup table of mark returned by probe word on answer word.
-#This can be computed manually by calling precomputeProbeAnswerMarkAr(), or else
-#it will get filled in as needed in the call to countMoves()...
+#This can be computed by calling precomputeProbeAnswerMarkAr(), which takes a few seconds,
+#or mapped from its file by loadProbeAnswerWordMarkAr(), or else it will get filled in
+#as needed in the call to countMoves()...
+#It is None until something needs it, see getProbeAnswerWordMarkAr().
 try:
     gl_probe_answer_word_mark_ar
 except:
-    gl_probe_answer_word_mark_ar = np.full([12972, 2315], -1)
+    gl_probe_answer_word_mark_ar = None
+
+#mark index values run 0 - 242, so this uint8 value is free to mean 'not computed yet'
+gl_mark_index_not_computed = 255
+
+#Guards creating gl_probe_answer_word_mark_ar, so scorers running in several threads
+#all get the same table, and filling in its rows, so a row is computed only once.
+gl_probe_answer_word_mark_ar_lock = threading.Lock()
+
+
+#Returns gl_probe_answer_word_mark_ar, creating it the first time it is needed.
+#The table is mapped from its file if there is one.  Otherwise it is allocated
+#with every entry gl_mark_index_not_computed, to be filled in as marks are computed.
+def getProbeAnswerWordMarkAr():
+    global gl_probe_answer_word_mark_ar
+    if gl_probe_answer_word_mark_ar is None:
+        with gl_probe_answer_word_mark_ar_lock:
+            if gl_probe_answer_word_mark_ar is None:
+                mark_ar = None
+                if findDataFilepath(gl_probe_answer_word_mark_ar_filename) != None:
+                    mark_ar = readProbeAnswerWordMarkArFromFile()
+                if mark_ar is None:
+                    mark_ar = np.full([len(gl_probe_word_list), len(gl_answer_word_list)],
+                                      gl_mark_index_not_computed, dtype=np.uint8)
+                gl_probe_answer_word_mark_ar = mark_ar
+    return gl_probe_answer_word_mark_ar
+
+
+#Returns gl_probe_answer_word_mark_ar after making sure that the rows for the probe word
+#indices in probe_word_index_ar have been computed.
+#A row is computed if its first entry is.  Rows are filled in under the lock, and the first
+#entry is written after the rest of the row, so a thread that checks without the lock never
+#sees a row as computed before all of it is.
+def getProbeAnswerWordMarkRows(probe_word_index_ar):
+    probe_answer_word_mark_ar = getProbeAnswerWordMarkAr()
+    probe_word_index_ar = np.asarray(probe_word_index_ar, dtype=np.intp)
+    if not (probe_answer_word_mark_ar[probe_word_index_ar, 0] == gl_mark_index_not_computed).any():
+        return probe_answer_word_mark_ar
+    with gl_probe_answer_word_mark_ar_lock:
+        not_computed_index_ar = \
+            probe_word_index_ar[probe_answer_word_mark_ar[probe_word_index_ar, 0] == gl_mark_index_not_computed]
+        if len(not_computed_index_ar) > 0:
+            not_computed_index_ar = np.unique(not_computed_index_ar)
+            mark_ar = markProbeWordsAgainstAnswerWordsAr(gl_probe_word_letter_ar[not_computed_index_ar],
+                                                         gl_answer_word_letter_ar)
+            probe_answer_word_mark_ar[not_computed_index_ar, 1:] = mark_ar[:, 1:]
+            probe_answer_word_mark_ar[not_computed_index_ar, 0] = mark_ar[:, 0]
+    return probe_answer_word_mark_ar
+
+
+#Converts a list of 5-letter words to a numpy array [len(word_list), 5] of uint8,
+#where each letter is coded 0-25 for 'a'-'z'.
+#This is the form of a word list used by the array versions of the mark functions.
+def makeWordLetterAr(word_list):
+    word_bytes = ''.join(word_list).encode('ascii')
+    letter_ar = np.frombuffer(word_bytes, dtype=np.uint8).reshape(len(word_list), 5) - ord('a')
+    return letter_ar
+
+gl_probe_word_letter_ar = makeWordLetterAr(gl_probe_word_list)
+gl_answer_word_letter_ar = makeWordLetterAr(gl_answer_word_list)
+gl_probe_word_letter_bit_ar = makeWordLetterBitAr(gl_probe_word_list)
+gl_answer_word_letter_bit_ar = makeWordLetterBitAr(gl_answer_word_list)
+
+
+#Inverted index of the probe words by letter, for qualifying probe words in hard mode.
+#Probe word sets are python int bitsets over gl_probe_word_list, bit i for word i.
+#gl_probe_letter_pos_bits[i_char][i_pos] is the set of probe words with char
+#gl_char_set[i_char] at position i_pos.
+#gl_probe_letter_bits[i_char] is the set of probe words with char gl_char_set[i_char] anywhere.
+def makeProbeLetterIndex():
+    global gl_probe_letter_pos_bits
+    global gl_probe_letter_bits
+    num_probe_words = len(gl_probe_word_list)
+    gl_probe_letter_pos_bits = []
+    gl_probe_letter_bits = []
+    for i_char in range(len(gl_char_set)):
+        letter_pos_bits = [indexArToBits(np.flatnonzero(gl_probe_word_letter_ar[:, i_pos] == i_char),
+                                         num_probe_words)
+                           for i_pos in range(5)]
+        gl_probe_letter_pos_bits.append(letter_pos_bits)
+        gl_probe_letter_bits.append(letter_pos_bits[0] | letter_pos_bits[1] | letter_pos_bits[2] |
+                                    letter_pos_bits[3] | letter_pos_bits[4])
+
+makeProbeLetterIndex()
+
+gl_all_probe_words_bits = (1 << len(gl_probe_word_list)) - 1
+
+
+#Returns the set of probe words that meet the char constraints in char_constraint_list,
+#the same words as pruneWordsPerCharConstraints(gl_probe_word_list, char_constraint_list),
+#as a python int bitset over gl_probe_word_list.
+#This takes a few set operations per constrained position and required char, using the
+#inverted index, and does not look at the probe words one by one.
+def qualifyProbeWordBits(char_constraint_list):
+    compiled_ccl = compileCharConstraintList(char_constraint_list)
+    placement_masks = makeRequiredPlacementMasks(compiled_ccl)
+    ok_bits = gl_all_probe_words_bits
+    #remove words with a char that is not allowed at its position
+    for i_pos in range(5):
+        not_allowed_mask = gl_all_chars_mask & ~compiled_ccl[i_pos]
+        i_char = 0
+        while not_allowed_mask:
+            if not_allowed_mask & 1:
+                ok_bits &= ~gl_probe_letter_pos_bits[i_char][i_pos]
+            not_allowed_mask >>= 1
+            i_char += 1
+    #keep words with each required char at a position where it is not already known
+    required_mask = compiled_ccl[5]
+    for i_char in range(len(gl_char_set)):
+        char_bit = 1 << i_char
+        if not required_mask & char_bit:
+            continue
+        placement_positions = [i_pos for i_pos in range(5) if placement_masks[i_pos] & char_bit]
+        if len(placement_positions) == 5:
+            placed_bits = gl_probe_letter_bits[i_char]
+        else:
+            placed_bits = 0
+            for i_pos in placement_positions:
+                placed_bits |= gl_probe_letter_pos_bits[i_char][i_pos]
+        ok_bits &= placed_bits
+    return ok_bits
+
+
+#Returns a numpy array of the indices in gl_probe_word_list of the probe words that meet
+#the char constraints in char_constraint_list.
+def qualifyProbeWordIndexAr(char_constraint_list):
+    return bitsToIndexAr(qualifyProbeWordBits(char_constraint_list), len(gl_probe_word_list))
+
+
+#This is the array version of markProbeWordAgainstCorrectWord().
+#It marks every probe word in probe_letter_ar against every answer word in answer_letter_ar,
+#where these are letter arrays [n, 5] from makeWordLetterAr().
+#Returns a numpy array [n_probe, n_answer] of uint8 mark index.
+#It takes the same two passes as markProbeWordAgainstCorrectWord(), but for all word pairs
+#at once.  First, mark the green chars, which counts those answer columns.  Then, in order of
+#probe char position, mark a probe char yellow if it matches an answer char in some other
+#column that has not been counted already, and count all such columns.
+#Probe words are processed in blocks of rows to keep the temporary boolean arrays small.
+def markProbeWordsAgainstAnswerWordsAr(probe_letter_ar, answer_letter_ar, block_rows = 512):
+    n_probe = len(probe_letter_ar)
+    n_answer = len(answer_letter_ar)
+    mark_ar = np.empty([n_probe, n_answer], dtype=np.uint8)
+    for i_row in range(0, n_probe, block_rows):
+        block_letter_ar = probe_letter_ar[i_row:i_row + block_rows]
+        #char_eq[i_pos][i_word] is [n_block, n_answer]: probe char at i_pos == answer char at i_word
+        char_eq = [[block_letter_ar[:, i_pos, None] == answer_letter_ar[None, :, i_word]
+                    for i_word in range(5)] for i_pos in range(5)]
+        green = [char_eq[i][i] for i in range(5)]
+        not_counted = [~green[i] for i in range(5)]
+        block_mark_ar = np.zeros([len(block_letter_ar), n_answer], dtype=np.uint8)
+        for i_pos in range(5):
+            yellow = np.zeros_like(green[i_pos])
+            not_green = ~green[i_pos]
+            for i_word in range(5):
+                if i_word == i_pos:
+                    continue
+                match = char_eq[i_pos][i_word] & not_counted[i_word] & not_green
+                yellow |= match
+                not_counted[i_word] &= ~match
+            #digit is 0 for green, 1 for yellow, 2 for gray
+            digit = 2 - 2 * green[i_pos].view(np.uint8) - yellow.view(np.uint8)
+            block_mark_ar += digit * gl_mark_digit_weights[i_pos]
+        mark_ar[i_row:i_row + block_rows] = block_mark_ar
+    return mark_ar
 
 
 
 #creates gl_probe_answer_word_mark_ar as a numpy array and stuffs it with
 #int index values for the combo mark
-#This takes only a few minutes, which is but a fraction of the time it takes to
-#compute probe counts for the full answer_word_list.
-#So this only worth writing out to a file in the case of rapid turnaround experimentation.
+#Using the array version of the mark function, this takes only a few seconds, which is
+#less than filling the table in one mark at a time as the search goes.
 def precomputeProbeAnswerMarkAr():
     global gl_probe_answer_word_mark_ar
-    probe_answer_word_mark_ar = np.full([12972, 2315], -1)
-    for i_probe_word in range(len(gl_probe_word_list)):
-        if i_probe_word % 100 == 0:
-            print(' ' + str(i_probe_word), end='', flush=True)
-        probe_word = gl_probe_word_list[i_probe_word]
-        for i_answer_word in range(len(gl_answer_word_list)):
-            answer_word = gl_answer_word_list[i_answer_word]
-            combo = markProbeWordAgainstCorrectWord(probe_word, answer_word)
-            tcombo = tuple(combo)
-            mark_index = gl_tcombo_mark_index_dict[tcombo]
-            probe_answer_word_mark_ar[i_probe_word, i_answer_word] = mark_index
-    gl_probe_answer_word_mark_ar = probe_answer_word_mark_ar
+    gl_probe_answer_word_mark_ar = \
+        markProbeWordsAgainstAnswerWordsAr(gl_probe_word_letter_ar, gl_answer_word_letter_ar)
+
+gl_probe_answer_word_mark_ar_filename = 'probe-answer-word-mark-ar.bin'
+
+
+#Binary file format for a table indexed by two word lists, such as
+#gl_probe_answer_word_mark_ar, which is indexed by gl_probe_word_list and gl_answer_word_list.
+#The file is a 64 byte header followed by the table in row order.
+#header:  8 bytes  magic b'WATABLE1'
+#         8 bytes  numpy dtype str, like b'|u1', padded with spaces
+#         4 bytes  uint32 number of rows
+#         4 bytes  uint32 number of columns
+#        16 bytes  md5 checksum of the row word list
+#        16 bytes  md5 checksum of the column word list
+#         8 bytes  padding
+#The checksums make sure that a table is never used with word lists other than the ones
+#it was made from.  The table is read back with np.memmap, so opening it takes milliseconds,
+#and processes that open the same file share it through the page cache.
+gl_word_table_file_magic = b'WATABLE1'
+gl_word_table_file_header_len = 64
+
+
+def makeWordListChecksum(word_list):
+    return hashlib.md5('\n'.join(word_list).encode('utf-8')).digest()
+
+
+def writeWordTableArToFile(table_ar, row_word_list, col_word_list, filename):
+    if table_ar.shape != (len(row_word_list), len(col_word_list)):
+        print('Problem: table_ar has shape ' + str(table_ar.shape) + ' but the word lists have lengths ' + \
+              str(len(row_word_list)) + ', ' + str(len(col_word_list)))
+        return
+    header = gl_word_table_file_magic
+    header += table_ar.dtype.str.encode('ascii').ljust(8)
+    header += struct.pack('<II', len(row_word_list), len(col_word_list))
+    header += makeWordListChecksum(row_word_list) + makeWordListChecksum(col_word_list)
+    header = header.ljust(gl_word_table_file_header_len, b'\0')
+    with open(filename, 'wb') as file:
+        file.write(header)
+        np.ascontiguousarray(table_ar).tofile(file)
+
+
+#Returns a read-only np.memmap of the table in the file, or None if the file is missing
+#or was not made from row_word_list and col_word_list.
+def readWordTableArFromFile(filename, row_word_list, col_word_list):
+    filepath = findDataFilepath(filename)
+    if filepath == None:
+        print('Problem: could not find file ' + filename + ' at either current dir or ../data/ dir')
+        return
+    with open(filepath, 'rb') as file:
+        header = file.read(gl_word_table_file_header_len)
+    if len(header) != gl_word_table_file_header_len or \
+       header[0:8] != gl_word_table_file_magic:
+        print('Problem: ' + filepath + ' is not a word table file')
+        return
+    dtype = np.dtype(header[8:16].decode('ascii').strip())
+    n_rows, n_cols = struct.unpack('<II', header[16:24])
+    if n_rows != len(row_word_list) or n_cols != len(col_word_list) or \
+       header[24:40] != makeWordListChecksum(row_word_list) or \
+       header[40:56] != makeWordListChecksum(col_word_list):
+        print('Problem: ' + filepath + ' was made from different word lists')
+        return
+    return np.memmap(filepath, dtype=dtype, mode='r', offset=gl_word_table_file_header_len,
+                     shape=(n_rows, n_cols))
 
-gl_probe_answer_word_mark_ar_filename = 'probe-answer-word-mark-ar.text'
 
 def writeProbeAnswerWordMarkArToFile(filename = None):
-    if len(gl_probe_answer_word_mark_ar) != len(gl_probe_word_list) * len(gl_answer_word_list):
-        print('gl_probe_answer_word_mark_ar has unexpected size ' + str(len(gl_probe_answer_word_mark_ar)))
     if filename == None:
         filename = gl_probe_answer_word_mark_ar_filename
+    if gl_probe_answer_word_mark_ar is None or \
+       (gl_probe_answer_word_mark_ar == gl_mark_index_not_computed).any():
+        print('Problem: gl_probe_answer_word_mark_ar is not completely computed, call precomputeProbeAnswerMarkAr()')
+        return
+    writeWordTableArToFile(gl_probe_answer_word_mark_ar, gl_probe_word_list, gl_answer_word_list,
+                           filename)
 
-    with open(filename, 'w', encoding='utf-8') as file:
-        for i_probe_word in range(len(gl_probe_word_list)):
-            for i_answer_word in range(len(gl_answer_word_list)):
-                file.write(str(gl_probe_answer_word_mark_ar[i_probe_word, i_answer_word]))
 
-                
 def readProbeAnswerWordMarkArFromFile(filename = None):
-    probe_answer_word_mark_ar = np.full([12972, 2315], -1)
+    if filename == None:
+        filename = gl_probe_answer_word_mark_ar_filename
+    return readWordTableArFromFile(filename, gl_probe_word_list, gl_answer_word_list)
+
+
+#Sets gl_probe_answer_word_mark_ar by mapping it from its file.  If there is no usable
+#file, this computes the table and writes the file, so the next session can map it.
+def loadProbeAnswerWordMarkAr(filename = None):
+    global gl_probe_answer_word_mark_ar
+    if filename == None:
+        filename = gl_probe_answer_word_mark_ar_filename
+    mark_ar = None
+    if findDataFilepath(filename) != None:
+        mark_ar = readProbeAnswerWordMarkArFromFile(filename)
+    if mark_ar is None:
+        print('computing gl_probe_answer_word_mark_ar and writing it to ' + filename)
+        precomputeProbeAnswerMarkAr()
+        writeProbeAnswerWordMarkArToFile(filename)
+        mark_ar = readProbeAnswerWordMarkArFromFile(filename)
+    gl_probe_answer_word_mark_ar = mark_ar
+
+
+#For each probe word, the answer words in order of the mark they get from the probe word,
+#so that the answer words that get any one mark are a contiguous run.  This makes a
+#(probe word, mark) -> answer words table in compressed row form:
+#gl_probe_mark_answer_word_order_ar  numpy array [12972, 2315] of uint16 answer word index,
+#                                    each row sorted by mark, and by index within a mark
+#gl_probe_mark_answer_word_offset_ar numpy array [12972, 244] of uint16.  The answer words that
+#                                    get mark_index from probe word i_probe are at
+#                                    gl_probe_mark_answer_word_order_ar[i_probe, start:end]
+#                                    where start, end = offset_ar[i_probe, mark_index:mark_index+2]
+#The order table is written to its file in the word table format.  The offsets are counted
+#from the mark table when the order table is loaded, which takes a fraction of a second.
+#Set these up with loadProbeMarkAnswerWordArs().
+try:
+    gl_probe_mark_answer_word_order_ar
+except:
+    gl_probe_mark_answer_word_order_ar = None
+    gl_probe_mark_answer_word_offset_ar = None
+
+gl_probe_mark_answer_word_order_ar_filename = 'probe-mark-answer-word-order-ar.bin'
+
+
+#Returns a numpy array [n_probe, 244] of the offsets of each mark's run of answer words in
+#the rows of the order table, from the mark table rows mark_ar [n_probe, n_answer].
+def makeProbeMarkAnswerWordOffsetAr(mark_ar, block_rows = 512):
+    n_probe = len(mark_ar)
+    offset_ar = np.zeros([n_probe, 244], dtype=np.uint16)
+    for i_start in range(0, n_probe, block_rows):
+        block_mark_ar = np.asarray(mark_ar[i_start:i_start + block_rows])
+        n_block = len(block_mark_ar)
+        offset_mark_ar = block_mark_ar + (np.arange(n_block, dtype=np.intp) * 243)[:, None]
+        mark_count_ar = np.bincount(offset_mark_ar.ravel(), minlength=n_block * 243).reshape(n_block, 243)
+        offset_ar[i_start:i_start + n_block, 1:] = np.cumsum(mark_count_ar, axis=1)
+    return offset_ar
+
+
+#Returns the mark table with every row computed.
+def getFullProbeAnswerWordMarkAr():
+    return getProbeAnswerWordMarkRows(np.arange(len(gl_probe_word_list)))
+
+
+#Computes the order table from the full mark table.  This takes a fraction of a second.
+def precomputeProbeMarkAnswerWordOrderAr():
+    global gl_probe_mark_answer_word_order_ar
+    probe_answer_word_mark_ar = getFullProbeAnswerWordMarkAr()
+    order_ar = np.empty(probe_answer_word_mark_ar.shape, dtype=np.uint16)
+    for i_start in range(0, len(order_ar), 512):
+        order_ar[i_start:i_start + 512] = \
+            np.argsort(probe_answer_word_mark_ar[i_start:i_start + 512], axis=1, kind='stable')
+    gl_probe_mark_answer_word_order_ar = order_ar
+
+
+def writeProbeMarkAnswerWordOrderArToFile(filename = None):
+    if filename == None:
+        filename = gl_probe_mark_answer_word_order_ar_filename
+    if gl_probe_mark_answer_word_order_ar is None:
+        print('Problem: gl_probe_mark_answer_word_order_ar is None, call precomputeProbeMarkAnswerWordOrderAr()')
+        return
+    writeWordTableArToFile(gl_probe_mark_answer_word_order_ar, gl_probe_word_list, gl_answer_word_list,
+                           filename)
+
+
+def readProbeMarkAnswerWordOrderArFromFile(filename = None):
+    if filename == None:
+        filename = gl_probe_mark_answer_word_order_ar_filename
+    return readWordTableArFromFile(filename, gl_probe_word_list, gl_answer_word_list)
+
+
+#Sets up gl_probe_mark_answer_word_order_ar and gl_probe_mark_answer_word_offset_ar.
+#The order table is mapped from its file.  If there is no usable file, this computes
+#the order table and writes the file, so the next session can map it.
+#This is for the search, see setupCountMoves().  Pruning words works without it.
+def loadProbeMarkAnswerWordArs(filename = None):
+    global gl_probe_mark_answer_word_order_ar
+    global gl_probe_mark_answer_word_offset_ar
+    if filename == None:
+        filename = gl_probe_mark_answer_word_order_ar_filename
+    order_ar = None
+    if findDataFilepath(filename) != None:
+        order_ar = readProbeMarkAnswerWordOrderArFromFile(filename)
+    if order_ar is None:
+        print('computing gl_probe_mark_answer_word_order_ar and writing it to ' + filename)
+        precomputeProbeMarkAnswerWordOrderAr()
+        writeProbeMarkAnswerWordOrderArToFile(filename)
+        order_ar = readProbeMarkAnswerWordOrderArFromFile(filename)
+    gl_probe_mark_answer_word_offset_ar = makeProbeMarkAnswerWordOffsetAr(getFullProbeAnswerWordMarkAr())
+    gl_probe_mark_answer_word_order_ar = order_ar
+    getProbeMarkAnswerWordSet.cache_clear()
+
+
+#Sets of up to this many words are built bit by bit, larger ones with numpy.
+gl_word_set_build_bits_len = 64
+
+#The number of (probe word, mark) answer word sets kept by getProbeMarkAnswerWordSet().
+#A WordSet's bits take at most about 300 bytes, so the cache stays within some tens of MB.
+gl_probe_mark_answer_word_set_cache_size = 1 << 16
+
+
+#Returns the WordSet of answer words that get mark_index from the probe word at i_probe_word
+#in gl_probe_word_list.  Word sets are built as they are asked for, from the order table if it
+#has been loaded, see setupCountMoves(), or else from the probe word's row of the mark table,
+#so that pruning a game's words does not compute the whole table.  The most recently used
+#word sets are kept.
+@functools.lru_cache(maxsize = gl_probe_mark_answer_word_set_cache_size)
+def getProbeMarkAnswerWordSet(i_probe_word, mark_index):
+    if gl_probe_mark_answer_word_offset_ar is None:
+        mark_row_ar = getProbeAnswerWordMarkRows([i_probe_word])[i_probe_word]
+        word_index_ar = np.flatnonzero(mark_row_ar == mark_index)
+    else:
+        i_start = int(gl_probe_mark_answer_word_offset_ar[i_probe_word, mark_index])
+        i_end = int(gl_probe_mark_answer_word_offset_ar[i_probe_word, mark_index + 1])
+        word_index_ar = gl_probe_mark_answer_word_order_ar[i_probe_word, i_start:i_end]
+    if len(word_index_ar) > gl_word_set_build_bits_len:
+        return makeWordSetFromIndexAr(word_index_ar)
+    bits = 0
+    for i_word in word_index_ar.tolist():
+        bits |= 1 << i_word
+    return WordSet(bits)
+
+
+#Word index arrays at least this long are partitioned with numpy argsort, shorter ones
+#with a dict, which is faster for them.
+gl_partition_numpy_len = 200
+
+#The number of probe words whose marks partitionWordIndexArByProbeMarks() gathers at a time.
+gl_partition_block_rows = 512
+
+
+#Partition kernel for the search.  Splits the answer words at the indices in word_index_ar
+#into buckets by the mark that each gets from a probe word, for each probe word at the
+#indices in probe_word_index_ar in turn.  Marks are gathered from the mark table for a block
+#of probe words at a time, so a caller that stops early does not pay for the rest.
+#This is a generator that yields, per probe word, three parallel lists, one entry per bucket:
+#  bucket_mark_list:        int mark_index of the bucket
+#  bucket_size_list:        int number of answer words in the bucket
+#  bucket_word_index_list:  list of int answer word indices in the bucket
+#Buckets are in the order their marks first appear in word_index_ar, and the indices in
+#a bucket keep their order in word_index_ar.
+def partitionWordIndexArByProbeMarks(word_index_ar, probe_word_index_ar, block_rows = None):
+    if block_rows == None:
+        block_rows = gl_partition_block_rows
+    word_index_ar = np.asarray(word_index_ar, dtype=np.intp)
+    probe_word_index_ar = np.asarray(probe_word_index_ar, dtype=np.intp)
+    word_index_list = word_index_ar.tolist()
+    numpy_p = len(word_index_list) >= gl_partition_numpy_len
+    for i_start in range(0, len(probe_word_index_ar), block_rows):
+        probe_block_ar = probe_word_index_ar[i_start:i_start + block_rows]
+        #a plain ndarray view avoids the memmap overhead on every index
+        probe_answer_word_mark_ar = np.asarray(getProbeAnswerWordMarkRows(probe_block_ar))
+        block_mark_ar = probe_answer_word_mark_ar[probe_block_ar[:, None], word_index_ar]
+        if numpy_p:
+            for mark_ar in block_mark_ar:
+                yield partitionWordIndexArByMarkAr(word_index_ar, mark_ar)
+            continue
+        for mark_list in block_mark_ar.tolist():
+            bucket_dict = {}     #key: mark_index   value: list of int answer word index
+            for i_word, mark_index in zip(word_index_list, mark_list):
+                bucket = bucket_dict.get(mark_index)
+                if bucket == None:
+                    bucket_dict[mark_index] = [i_word]
+                else:
+                    bucket.append(i_word)
+            bucket_word_index_list = list(bucket_dict.values())
+            yield list(bucket_dict.keys()), [len(bucket) for bucket in bucket_word_index_list], \
+                  bucket_word_index_list
+
+
+#The numpy form of one partition in partitionWordIndexArByProbeMarks(), where mark_ar holds
+#the marks of the answer words at the indices in word_index_ar.
+def partitionWordIndexArByMarkAr(word_index_ar, mark_ar):
+    #stable sort groups the words by mark keeping their order, then the first word of each
+    #group gives the order of first appearance of its mark
+    order_ar = np.argsort(mark_ar, kind='stable')
+    sorted_mark_ar = mark_ar[order_ar]
+    new_mark_p_ar = np.empty(len(sorted_mark_ar), dtype=bool)
+    new_mark_p_ar[0] = True
+    np.not_equal(sorted_mark_ar[1:], sorted_mark_ar[:-1], out=new_mark_p_ar[1:])
+    start_ar = np.flatnonzero(new_mark_p_ar)
+    size_ar = np.diff(np.append(start_ar, len(sorted_mark_ar)))
+    bucket_order_ar = np.argsort(order_ar[start_ar])
+    grouped_word_index_list = word_index_ar[order_ar].tolist()
+    bucket_size_list = size_ar[bucket_order_ar].tolist()
+    bucket_word_index_list = [grouped_word_index_list[i_start:i_start + size]
+                              for i_start, size in zip(start_ar[bucket_order_ar].tolist(), bucket_size_list)]
+    return sorted_mark_ar[start_ar[bucket_order_ar]].tolist(), bucket_size_list, bucket_word_index_list
+
+
+# 12972 x 12972 lookup table of mark returned by probe word on probe word, treating the
+#second probe word as the answer word.  This is optional, about 168 MB, for exact hard mode
+#probe word qualification:  after probe word p got mark m, probe word q is consistent with
+#that cue exactly when markProbeWordAgainstCorrectWord(p, q) == m, which is one comparison
+#along row p of this table.  See qualifyProbeWordIndexArPerCues().
+#Set it up with loadProbeProbeWordMarkAr(), which maps it from its file, or computes it
+#and writes the file the first time.  It is None until then.
+try:
+    gl_probe_probe_word_mark_ar
+except:
+    gl_probe_probe_word_mark_ar = None
+
+gl_probe_probe_word_mark_ar_filename = 'probe-probe-word-mark-ar.bin'
+
+
+#Computes the probe x probe mark table with the array version of the mark function.
+#This takes several seconds.
+def precomputeProbeProbeWordMarkAr():
+    global gl_probe_probe_word_mark_ar
+    gl_probe_probe_word_mark_ar = \
+        markProbeWordsAgainstAnswerWordsAr(gl_probe_word_letter_ar, gl_probe_word_letter_ar)
+
+
+def writeProbeProbeWordMarkArToFile(filename = None):
+    if filename == None:
+        filename = gl_probe_probe_word_mark_ar_filename
+    if gl_probe_probe_word_mark_ar is None:
+        print('Problem: gl_probe_probe_word_mark_ar is None, call precomputeProbeProbeWordMarkAr()')
+        return
+    writeWordTableArToFile(gl_probe_probe_word_mark_ar, gl_probe_word_list, gl_probe_word_list,
+                           filename)
+
+
+def readProbeProbeWordMarkArFromFile(filename = None):
+    if filename == None:
+        filename = gl_probe_probe_word_mark_ar_filename
+    return readWordTableArFromFile(filename, gl_probe_word_list, gl_probe_word_list)
 
-    i_probe_word = 0
-    i_answer_word = 0
-    
-    with open(filename, 'r', encoding='utf-8') as file:
-        for line in file:
-            if line.find('#') == 0:
-                continue
-            line.strip('\n')
-            line = line.strip('\'')
-            mark_index = int(line)
-            if i_answer_word == 2315:
-                i_probe_word += 1
-                i_answer_word = 0
-                probe_answer_word_mark_ar[i_probe_word, i_answer_word] = mark_index
-    if i_probe_word != 12972 or i_answer_word != 2315:
-        print('problem in readProbeAnswerWordMarkArFromFile()')
-    return 
+
+#Sets gl_probe_probe_word_mark_ar by mapping it from its file.  If there is no usable
+#file, this computes the table and writes the file, so the next session can map it.
+def loadProbeProbeWordMarkAr(filename = None):
+    global gl_probe_probe_word_mark_ar
+    if filename == None:
+        filename = gl_probe_probe_word_mark_ar_filename
+    mark_ar = None
+    if findDataFilepath(filename) != None:
+        mark_ar = readProbeProbeWordMarkArFromFile(filename)
+    if mark_ar is None:
+        print('computing gl_probe_probe_word_mark_ar and writing it to ' + filename)
+        precomputeProbeProbeWordMarkAr()
+        writeProbeProbeWordMarkArToFile(filename)
+        mark_ar = readProbeProbeWordMarkArFromFile(filename)
+    gl_probe_probe_word_mark_ar = mark_ar
+
+
+#Qualifies probe words for hard mode exactly, using gl_probe_probe_word_mark_ar.
+#cue_list_list is the list of cues so far, each a cue_list [probe_word, mark_index].
+#A probe word qualifies when it would get the same mark from every past probe word as the
+#answer word did.
+#probe_word_index_ar is a numpy array of indices in gl_probe_word_list of the candidate probe
+#words, or None for all of gl_probe_word_list.
+#Returns a numpy array of the indices of the qualified probe words, or None if the table
+#is not loaded or a past probe word is not in gl_probe_word_list.
+def qualifyProbeWordIndexArPerCues(cue_list_list, probe_word_index_ar = None):
+    if gl_probe_probe_word_mark_ar is None:
+        return None
+    if probe_word_index_ar is None:
+        probe_word_index_ar = np.arange(len(gl_probe_word_list))
+    for cue_list in cue_list_list:
+        i_probe_word = gl_probe_word_index_dict.get(cue_list[0])
+        if i_probe_word == None:
+            return None
+        mark_ar = gl_probe_probe_word_mark_ar[i_probe_word]
+        probe_word_index_ar = probe_word_index_ar[mark_ar[probe_word_index_ar] == cue_list[1]]
+    return probe_word_index_ar
 
 
 
@@ -1640,7 +3223,7 @@ except:
 #No longer used.
 #Load this as follows:
 #>>> wa.gl_level_1_probe_word_entropies_dict_salet = wa.readLevel1ProbeWordEntropiesDictFromFile('level-1-probe-word-entropies-dict-salet.text')
-#key:   str combo like 'yyylr'
+#key:   int mark_index
 #value: list tuple:  (probe_word, entropy)
 try:
     gl_level_1_probe_word_entropies_dict_salet
@@ -1677,9 +3260,12 @@ def setupCountMoves():
     #print('loading level-1-probe-word-entropies-dict-salet.text')
     #gl_level_1_probe_word_entropies_dict_salet = readLevel1ProbeWordEntropiesDictFromFile('level-1-probe-word-entropies-dict-salet.text')
 
-    global gl_probe_word_entropies_list    
-    print('loading probe-words-12972-entropies-on-answer-words-2315.text')
-    gl_probe_word_entropies_list = readProbeWordEntropiesFromFile('probe-words-12972-entropies-on-answer-words-2315.text')
+    print('loading ' + gl_probe_word_entropies_filename)
+    loadProbeWordEntropies()
+
+    #mapping the whole mark table up front is faster than filling it in during search
+    loadProbeAnswerWordMarkAr()
+    loadProbeMarkAnswerWordArs()
 
 
 #key: rec_depth
@@ -1694,7 +3280,7 @@ except:
 #A probe_policy is a list:
 #[probe_word, mark_tree]
 #where
-#mark_tree is a dict:  key: tuple combo_mark
+#mark_tree is a dict:  key: int mark_index
 #                      value: either
 #                        -a list of remaining_answer_words delivered by the probe_word_path to this level
 #                        -a probe_policy (list: [next probe_word and mark_tree])
@@ -1714,6 +3300,307 @@ except:
     gl_exit_after_fast_only_p = False
 
 
+########################################
+#
+#Transposition tables for the countMoves...() search
+#
+#The cost found for a set of remaining answer words is kept in a fixed capacity table keyed
+#by a 64-bit Zobrist key of the set:  the XOR of a random 64-bit number per answer word.
+#The key of a bucket of words is built from its word indices, so no word strings or
+#WordSets are needed to look it up.
+#There is one table per bound_intent, 'fast' and 'full', each taking half of
+#gl_transposition_table_mb.
+#Only the cost and best probe word of a set are kept.  Probe policies are rebuilt from the
+#tables when the search is done, by reconstructProbePolicy().
+
+gl_transposition_table_mb = 256
+
+#The number of consecutive slots a key may occupy, starting at its home slot.
+gl_transposition_table_probe_len = 4
+
+#Bound types of a table entry.
+#  gl_bound_exact:  cost is the cost of the set
+#  gl_bound_lower:  the cost of the set is at least cost.  A search under a cost ceiling
+#                   found no probe word under the ceiling.
+#  gl_bound_upper:  the cost of the set is at most cost, by the probe word of the entry.
+#                   The fast pass bound of a set whose full search is under way.
+gl_bound_exact = 0
+gl_bound_lower = 1
+gl_bound_upper = 2
+
+gl_zobrist_random_seed = 2315
+
+gl_answer_word_zobrist_ar = np.random.default_rng(gl_zobrist_random_seed).integers(
+    0, np.iinfo(np.uint64).max, size=len(gl_answer_word_list), dtype=np.uint64, endpoint=True)
+gl_answer_word_zobrist_list = gl_answer_word_zobrist_ar.tolist()
+
+#Word index lists at least this long are keyed with numpy.
+gl_zobrist_numpy_len = 64
+
+
+#Returns the int 64-bit Zobrist key of the set of answer words at the indices in
+#word_index_list, which may be a list or numpy array.
+def makeWordIndexZobristKey(word_index_list):
+    if len(word_index_list) >= gl_zobrist_numpy_len:
+        return int(np.bitwise_xor.reduce(gl_answer_word_zobrist_ar[np.asarray(word_index_list)]))
+    if isinstance(word_index_list, np.ndarray):
+        word_index_list = word_index_list.tolist()
+    key = 0
+    for i_word in word_index_list:
+        key ^= gl_answer_word_zobrist_list[i_word]
+    return key
+
+
+#Returns the Zobrist key of bucket i_bucket of bucket_word_index_list, a partition of the
+#num_words answer words whose key is key.  The keys of a partition's buckets XOR to key, so
+#a bucket with more than half of the words is keyed from key and the other buckets' words.
+def makeBucketZobristKey(key, num_words, bucket_word_index_list, i_bucket):
+    if 2 * len(bucket_word_index_list[i_bucket]) <= num_words:
+        return makeWordIndexZobristKey(bucket_word_index_list[i_bucket])
+    for i_other_bucket, word_index_list in enumerate(bucket_word_index_list):
+        if i_other_bucket != i_bucket:
+            key ^= makeWordIndexZobristKey(word_index_list)
+    return key
+
+
+#An open addressing table of search results held in numpy arrays, one entry per slot:
+#  key:      uint64 Zobrist key of the set of remaining answer words
+#  cost:     int64 cost of finding all of the words
+#  probe:    int32 index in gl_probe_word_list of the best probe word, -1 if none
+#  bound:    int8 bound type of cost, gl_bound_exact, gl_bound_lower, or gl_bound_upper
+#  size:     uint16 number of words in the set, 0 for an empty slot
+#The size is checked along with the key on lookup.  When all of a key's slots are taken,
+#the entry for the smallest set is replaced if it is no larger than the new one, since
+#small sets are the cheapest to search again.
+class TranspositionTable(object):
+    #entry bytes: key, cost, probe, bound, size
+    entry_bytes = 8 + 8 + 4 + 1 + 2
+
+    def __init__(self, mb = None):
+        if mb == None:
+            mb = gl_transposition_table_mb / 2
+        capacity = 1
+        while capacity * 2 * self.entry_bytes <= mb * 1024 * 1024:
+            capacity *= 2
+        self.mask = capacity - 1
+        self.key_ar = np.zeros(capacity, dtype=np.uint64)
+        self.cost_ar = np.zeros(capacity, dtype=np.int64)
+        self.probe_ar = np.full(capacity, -1, dtype=np.int32)
+        self.bound_ar = np.zeros(capacity, dtype=np.int8)
+        self.size_ar = np.zeros(capacity, dtype=np.uint16)
+        self.num_entries = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.rejections = 0
+
+    def __len__(self):
+        return self.num_entries
+
+    #Returns the slot holding key for a set of num_words words, or None.
+    def findSlot(self, key, num_words):
+        for i in range(gl_transposition_table_probe_len):
+            slot = (key + i) & self.mask
+            size = int(self.size_ar[slot])
+            if size == 0:
+                return None
+            if size == num_words and int(self.key_ar[slot]) == key:
+                return slot
+        return None
+
+    #Returns a tuple (cost, i_probe_word, bound) for key, or None if it is not in the table.
+    def lookup(self, key, num_words):
+        slot = self.findSlot(key, num_words)
+        if slot == None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return int(self.cost_ar[slot]), int(self.probe_ar[slot]), int(self.bound_ar[slot])
+
+    #Stores an entry for key.  Returns the key of the entry it replaced, or None.
+    #If the entry is not stored, returns key.
+    def store(self, key, num_words, cost, i_probe_word, bound = gl_bound_exact):
+        victim_slot = None
+        victim_size = None
+        for i in range(gl_transposition_table_probe_len):
+            slot = (key + i) & self.mask
+            size = int(self.size_ar[slot])
+            if size == 0 or (size == num_words and int(self.key_ar[slot]) == key):
+                victim_slot = slot
+                victim_size = 0
+                break
+            if victim_size == None or size < victim_size:
+                victim_slot = slot
+                victim_size = size
+        if victim_size > num_words:
+            self.rejections += 1
+            return key
+        evicted_key = None
+        if victim_size == 0:
+            if self.size_ar[victim_slot] == 0:
+                self.num_entries += 1
+        else:
+            evicted_key = int(self.key_ar[victim_slot])
+            self.evictions += 1
+        self.key_ar[victim_slot] = key
+        self.cost_ar[victim_slot] = cost
+        self.probe_ar[victim_slot] = i_probe_word
+        self.bound_ar[victim_slot] = bound
+        self.size_ar[victim_slot] = num_words
+        return evicted_key
+
+    def statsStr(self):
+        return 'entries: ' + str(self.num_entries) + ' of ' + str(self.mask + 1) + \
+               '  hits: ' + str(self.hits) + '  misses: ' + str(self.misses) + \
+               '  evictions: ' + str(self.evictions) + '  rejections: ' + str(self.rejections)
+
+
+#key: str bound_intent in {'fast', 'full'}
+#value: TranspositionTable
+try:
+    gl_transposition_table_dict
+except:
+    gl_transposition_table_dict = None
+
+
+#Sets up empty transposition tables for a new search.
+def resetTranspositionTables():
+    global gl_transposition_table_dict
+    gl_transposition_table_dict = {'fast': TranspositionTable(),
+                                   'full': TranspositionTable()}
+
+
+#Returns [cost, best_probe_word, bound] found for the word set with Zobrist key, or None.
+#best_probe_word is None if no probe word completed the set under the search's ceiling.
+def lookupProbeWordCost(bound_intent, key, num_words):
+    entry = gl_transposition_table_dict[bound_intent].lookup(key, num_words)
+    if entry == None:
+        return None
+    best_probe_word = None
+    if entry[1] >= 0:
+        best_probe_word = gl_probe_word_list[entry[1]]
+    return [entry[0], best_probe_word, entry[2]]
+
+
+#Stores cost and best_probe_word found for the word set with Zobrist key.
+def storeProbeWordCost(bound_intent, key, num_words, cost, best_probe_word, bound = gl_bound_exact):
+    i_probe_word = -1
+    if best_probe_word != None:
+        i_probe_word = gl_probe_word_index_dict.get(best_probe_word)
+    gl_transposition_table_dict[bound_intent].store(key, num_words, cost, i_probe_word, bound)
+
+
+def printTranspositionTableStats():
+    if gl_transposition_table_dict == None:
+        print('no transposition tables')
+        return
+    for bound_intent, table in gl_transposition_table_dict.items():
+        print(bound_intent + ' transposition table ' + table.statsStr())
+
+
+#For regression checking of the search.  Each check is [random_seed, i_sample, expected_cost]:
+#answer word sets are sampled as random.sample(gl_answer_word_list, randint(80, 200)) from a
+#random.Random(random_seed), and set i_sample is searched with probe_L0 'salet'.
+#[11, 5, 330] is a set where a fast pass with no best probe word yet used to pass its children
+#a cost ceiling, so a child no top probe word could split never added a probe word and the
+#search recursed without end.
+gl_count_moves_check_list = [[11, 5, 330]]
+
+
+#Runs countMovesToDistinguishAllRemainingWords() on the sets of check_list, see
+#gl_count_moves_check_list, and prints for each whether the search finished with the expected
+#cost, and with a probe_policy whose search paths sum to that cost.
+#Returns True if every check passed.
+def checkCountMovesSearch(check_list = None):
+    if check_list == None:
+        check_list = gl_count_moves_check_list
+    all_ok_p = True
+    for random_seed, i_sample, expected_cost in check_list:
+        rng = random.Random(random_seed)
+        for i in range(i_sample + 1):
+            answer_word_list = rng.sample(gl_answer_word_list, rng.randint(80, 200))
+        start_time = time.time()
+        try:
+            cost, probe_policy = countMovesToDistinguishAllRemainingWords(answer_word_list, 0, 'salet')
+        except RecursionError:
+            cost, probe_policy = None, None
+        policy_cost = None
+        if probe_policy != None:
+            policy_cost = sumSearchPathCost(buildSearchPathForAllWordsInProbePolicy(probe_policy))
+        ok_p = cost == expected_cost and policy_cost == expected_cost
+        all_ok_p = all_ok_p and ok_p
+        print('\nseed ' + str(random_seed) + ' set ' + str(i_sample) + ' (' + str(len(answer_word_list)) + \
+              ' words): cost ' + str(cost) + ' policy cost ' + str(policy_cost) + ' expected ' + \
+              str(expected_cost) + (' ok' if ok_p else ' FAILED') + \
+              '   {0:.1f} sec'.format(time.time() - start_time))
+    return all_ok_p
+
+
+#Rebuilds the probe_policy for remaining_word_list from the best probe words in the
+#transposition tables after a countMovesToDistinguishAllRemainingWords() search.
+#For bound_intent 'full', a set is looked up in the 'full' table, then the 'fast' one,
+#since the full search keeps the fast policy where it found nothing better.
+#A set that is in neither table, because its entry was replaced or holds only a lower
+#bound, is searched again.
+#probe_L0 and probe_word_path are as passed to the search for remaining_word_list.
+#A set searched with probe_L0 has no table entry, see countMoves...(), so probe_L0 is its
+#probe word.
+#Returns a probe_policy, list: [probe_word, mark_tree], or None if no probe word
+#completed the set.
+def reconstructProbePolicy(remaining_word_list, bound_intent = 'full', probe_L0 = None,
+                           probe_word_path = None):
+    if probe_word_path == None:
+        probe_word_path = []
+    remaining_word_set = makeWordSet(remaining_word_list)
+    remaining_word_index_ar = remaining_word_set.indexAr()
+    num_words = len(remaining_word_index_ar)
+    remaining_word_key = makeWordIndexZobristKey(remaining_word_index_ar)
+    if bound_intent == 'full':
+        table_bound_intent_list = ['full', 'fast']
+    else:
+        table_bound_intent_list = [bound_intent]
+    best_probe_word = probe_L0
+    cost_probe_word_list = None
+    table_entry_list = None     #the entry for the set in bound_intent's table
+    for table_bound_intent in table_bound_intent_list:
+        if probe_L0 != None:
+            break
+        cost_probe_word_list = lookupProbeWordCost(table_bound_intent, remaining_word_key, num_words)
+        if table_bound_intent == bound_intent:
+            table_entry_list = cost_probe_word_list or []
+        if cost_probe_word_list != None and cost_probe_word_list[2] != gl_bound_lower:
+            best_probe_word = cost_probe_word_list[1]
+            break
+        cost_probe_word_list = None
+    if cost_probe_word_list == None and probe_L0 == None:
+        best_probe_word_cost, best_probe_word = \
+            countMovesToDistinguishAllRemainingWords(remaining_word_set, len(probe_word_path), None,
+                                                     probe_word_path, None, ' ', bound_intent,
+                                                     None, remaining_word_key, table_entry_list)
+    if best_probe_word == None:
+        return None
+
+    mark_tree = {}
+    i_probe_word = gl_probe_word_index_dict.get(best_probe_word)
+    bucket_mark_list, bucket_size_list, bucket_word_index_list = \
+        next(partitionWordIndexArByProbeMarks(remaining_word_index_ar, [i_probe_word]))
+    if gl_correct_mark_index in bucket_mark_list:
+        mark_tree[gl_correct_mark_index] = best_probe_word
+    next_probe_word_path = probe_word_path + [best_probe_word]
+    for mark_index, n_answer_words_for_mark, word_index_list in \
+            zip(bucket_mark_list, bucket_size_list, bucket_word_index_list):
+        if mark_index == gl_correct_mark_index:
+            continue
+        answer_words_for_mark = [gl_answer_word_list[i_word] for i_word in word_index_list]
+        #a probe word that does not split the set is useless unless it is probe_L0
+        if n_answer_words_for_mark <= 2 or (n_answer_words_for_mark == num_words and probe_L0 == None):
+            mark_tree[mark_index] = answer_words_for_mark
+        else:
+            mark_tree[mark_index] = reconstructProbePolicy(answer_words_for_mark, bound_intent, None,
+                                                           next_probe_word_path)
+    return [best_probe_word, mark_tree]
+
+
 #Main attempt to replicate (v7)
 #http://sonorouschocolate.com/notes/index.php?title=The_best_strategies_for_Wordle
 #2022/02/03
@@ -1730,12 +3617,28 @@ except:
 #Returns two values: best_probe_word_cost, best_probe_policy
 #where probe_policy is a list:  [probe_word, mark_tree]
 #where
-#mark_tree is a dict:  key: tuple combo_mark
+#mark_tree is a dict:  key: int mark_index
 #                      value: either
 #                        -a list of remaining_answer_words delivered by the probe_word_path to this level
 #                        -a probe_policy (list: [next probe_word and mark_tree])
+#The recursive calls return best_probe_word_cost, best_probe_word instead, and record only
+#those in the transposition tables.  The probe_policy is rebuilt from the tables by
+#reconstructProbePolicy() once the search is done.
+#
+#cost_ceiling is the remaining budget from the parent search:  the parent only needs the cost
+#if it is less than cost_ceiling.  If no probe word costs less, this returns cost_ceiling
+#or a larger lower bound with best_probe_word None, and the table records it as a lower
+#bound.  A later visit with a ceiling no higher than the bound is cut off at once, and one
+#with a higher ceiling resumes knowing the bound.
+#
+#remaining_word_key is the Zobrist key of the remaining words, if the caller has it.
+#table_entry_list is what the caller found for them in bound_intent's transposition table,
+#[cost, best_probe_word, bound], or [] if nothing, so that they are looked up only once.
+#It is None if the caller did not look.
 #
-#This will apply sort to the remaining_word_list passed.
+#remaining_word_list may be a list of answer words or a WordSet.  The search carries
+#remaining words as WordSets.
+#This will apply sort to a remaining_word_list passed as a list.
 #This turns out to be too inefficient to deliver an answer on the full
 #2513 x 12972 answer-word/probe-word problem.   This appears to give the correct answers on
 #subsets of the problem.  I am not absolutely positive that I have all of the optimizations
@@ -1744,8 +3647,10 @@ except:
 #then use that to reduce the set of possible remaining answer words.
 #In my python implementation, this seems to be the processing bottleneck.
 def countMovesToDistinguishAllRemainingWords(remaining_word_list, rec_depth = 0, probe_L0 = 'salet',
-                                             received_probe_word_path = [], prev_level_tcombo = None,
-                                             aw_print_str = ' ', bound_intent = None):
+                                             received_probe_word_path = [], prev_level_mark_index = None,
+                                             aw_print_str = ' ', bound_intent = None,
+                                             cost_ceiling = None, remaining_word_key = None,
+                                             table_entry_list = None):
         
     if bound_intent == 'fast':
         depth_limit = gl_depth_limit_fast
@@ -1753,6 +3658,7 @@ def countMovesToDistinguishAllRemainingWords(remaining_word_list, rec_depth = 0,
         depth_limit = gl_depth_limit_full
     if rec_depth > depth_limit:
         print('D', end='', flush=True)
+        #not stored, since the cutoff depends on the depth the set was reached at, not on the set
         return gl_hit_bottom_cost, None
     
     #development and debugging
@@ -1768,21 +3674,8 @@ def countMovesToDistinguishAllRemainingWords(remaining_word_list, rec_depth = 0,
     #Actually needed by the program.
     global gl_probe_word_list_entropy_order   
     global gl_test_probe_word_list
-    global gl_probe_answer_word_mark_ar    #for efficiency in getting mark for probe per answer word
-    global gl_word_set_probe_cost_cache    #key: str bound_intent in {'fast', 'full'}, or None
-                                           #value: dict:
-                                           #key: tuple of word:   (w1, w2, ... )
-                                           #   where w1, w2... is a sorted list of
-                                           #   remaining answer words
-                                           #value: list: [probe_word_cost, probe_policy]
-                                           #  where probe_policy is a nested data structure:
-                                           #  list:  [probe_word, mark_tree]
-                                           #    where mark_tree is a dict:
-                                           #      key: combo_mark: tuple like ('y', 'l', 'y', 'r', 'y')
-                                           #      value: either
-                                           #       -a list of remaining_answer_words delivered
-                                           #        by the probe_word_path to this level
-                                           #       -a probe_policy (list: [next probe_word and mark_tree])
+    #Costs and best probe words found so far are in the transposition tables,
+    #gl_transposition_table_dict, keyed by the Zobrist key of the set of remaining answer words.
 
     #setup with the initial function call
     if rec_depth == 0 and bound_intent == None:
@@ -1792,8 +3685,7 @@ def countMovesToDistinguishAllRemainingWords(remaining_word_list, rec_depth = 0,
         gl_last_remaining_word_dict = {}
         gl_max_rec_depth_seen = max(rec_depth, gl_max_rec_depth_seen)
         gl_last_remaining_word_dict[rec_depth] = remaining_word_list
-        gl_word_set_probe_cost_cache = {'fast':{},   #Each dict is  key:    tuple: word list
-                                        'full':{}}   #              value:  list: [cost, probe_policy]
+        resetTranspositionTables()
 
         #setup probe word lists
         if gl_probe_word_list_entropy_order == None:
@@ -1805,29 +3697,75 @@ def countMovesToDistinguishAllRemainingWords(remaining_word_list, rec_depth = 0,
         if gl_test_probe_word_list == None:
             gl_test_probe_word_list = gl_probe_word_list_entropy_order[0:gl_top_n_probe_words_to_test]
 
-        remaining_word_list.sort()
+        if not isinstance(remaining_word_list, WordSet):
+            remaining_word_list.sort()
         #really launch into the program
-        return countMovesToDistinguishAllRemainingWords(remaining_word_list, 0, probe_L0,
-                                                        received_probe_word_path,
-                                                        None, ' ', 'full')
+        best_probe_word_cost, best_probe_word = \
+            countMovesToDistinguishAllRemainingWords(remaining_word_list, 0, probe_L0,
+                                                     received_probe_word_path,
+                                                     None, ' ', 'full')
+        if gl_exit_after_fast_only_p:
+            return [best_probe_word_cost, gl_last_fast_cost_probe_policy[1]]
+        best_probe_policy = reconstructProbePolicy(remaining_word_list, 'full', probe_L0,
+                                                   received_probe_word_path)
+        print('probe_policy: ' + str(best_probe_policy) + '\n\n')
+        return best_probe_word_cost, best_probe_policy
         
+    #The word list of a WordSet is in sorted order, so the search goes through the
+    #remaining words in the same order however they were passed.
+    remaining_word_set = makeWordSet(remaining_word_list)
+    if remaining_word_set == None:
+        print('Problem: remaining_word_list has words that are not answer words')
+        return
+    remaining_word_list = remaining_word_set.wordList()
+    remaining_word_index_ar = remaining_word_set.indexAr()
+    if remaining_word_key == None:
+        remaining_word_key = makeWordIndexZobristKey(remaining_word_index_ar)
+
     gl_max_rec_depth_seen = max(rec_depth, gl_max_rec_depth_seen)
     gl_last_remaining_word_dict[rec_depth] = remaining_word_list  
     if len(remaining_word_list) > 200:
         gl_big_remaining_word_list_list.append(remaining_word_list[:])
 
-    #Return the cached value, [cost, probe_policy] if available from the cache
-    #should be sorted already so this tuple should be consistent throughout recursive calls
-    tup_rem_wds_list = tuple(remaining_word_list) 
-    mark_cost_probe_policy_list_bi = None
-    mark_cost_probe_policy_list_bi = gl_word_set_probe_cost_cache[bound_intent].get(tup_rem_wds_list)
-    if mark_cost_probe_policy_list_bi != None:
-        return mark_cost_probe_policy_list_bi
+    #A ceiling that lets any completed probe word under it is no ceiling.  Without one,
+    #a fast search that completes no probe word adds a probe word and tries again, below.
+    if cost_ceiling != None and cost_ceiling >= gl_big_number:
+        cost_ceiling = None
+
+    #Every word takes at least one probe, and all but one at least two, so a ceiling at or
+    #below that cuts the search off before it starts.
+    known_lower_bound = 2 * len(remaining_word_list) - 1
+    if cost_ceiling != None and known_lower_bound >= cost_ceiling:
+        return known_lower_bound, None
+
+    #Return the value, [cost, best_probe_word], if available from the transposition table,
+    #or cut off if a lower bound there is already at the ceiling.  Otherwise a lower bound
+    #or a fast pass upper bound there is a start for the search.
+    #The cost with the probe word restricted to probe_L0 is not the cost of the set,
+    #so it is neither looked up nor stored.
+    #(A probe_L0 that does not split the set leaves a child with the same set.)
+    upper_bound_probe_word_list = None
+    if probe_L0 == None:
+        if table_entry_list == None:
+            mark_cost_probe_word_list_bi = lookupProbeWordCost(bound_intent, remaining_word_key,
+                                                               len(remaining_word_list))
+        else:
+            mark_cost_probe_word_list_bi = table_entry_list or None
+        if mark_cost_probe_word_list_bi != None:
+            cost, probe_word, bound = mark_cost_probe_word_list_bi
+            if bound == gl_bound_exact:
+                return cost, probe_word
+            if bound == gl_bound_lower:
+                if cost_ceiling != None and cost >= cost_ceiling:
+                    return cost, None     #cut off, no probe word can be under the ceiling
+                known_lower_bound = max(known_lower_bound, cost)
+            else:
+                upper_bound_probe_word_list = [cost, probe_word]
 
     #If bound_intent is 'full', call self recursively to first obtain an upper cost bound in 'fast' mode.
     if bound_intent == 'fast':
         best_probe_word_cost = gl_big_number
-        best_probe_policy = None
+        best_probe_word = None
         if probe_L0 != None:
             probe_word_list = [probe_L0]
         else:
@@ -1835,24 +3773,29 @@ def countMovesToDistinguishAllRemainingWords(remaining_word_list, rec_depth = 0,
         a_or_b = 'a'
 
     else:
-#        mark_cost_probe_policy_list_full = None
-#        mark_cost_probe_policy_list_full = gl_word_set_probe_cost_cache['full'].get(tup_rem_wds_list)
-#        if mark_cost_probe_policy_list_full != None:
-#            return mark_cost_probe_policy_list_full
-        fast_cost_bound, fast_probe_policy = \
-                    countMovesToDistinguishAllRemainingWords(remaining_word_list,
+        if upper_bound_probe_word_list != None:
+            fast_cost_bound, fast_probe_word = upper_bound_probe_word_list
+        else:
+            fast_cost_bound, fast_probe_word = \
+                    countMovesToDistinguishAllRemainingWords(remaining_word_set,
                                                              rec_depth, probe_L0,
                                                              received_probe_word_path,
                                                              None, ' ',
-                                                             'fast')
+                                                             'fast', cost_ceiling,
+                                                             remaining_word_key)
+            if probe_L0 == None and fast_probe_word != None:
+                storeProbeWordCost(bound_intent, remaining_word_key, len(remaining_word_list),
+                                   fast_cost_bound, fast_probe_word, gl_bound_upper)
         if rec_depth == 0:
-            gl_last_fast_cost_probe_policy = [fast_cost_bound, fast_probe_policy]            
+            gl_last_fast_cost_probe_policy = [fast_cost_bound,
+                                              reconstructProbePolicy(remaining_word_set, 'fast', probe_L0,
+                                                                     received_probe_word_path)]
             print('\npass 1 fast complete')
             if gl_exit_after_fast_only_p:
-                return [fast_cost_bound, fast_probe_policy]
+                return [fast_cost_bound, fast_probe_word]
         
         best_probe_word_cost = fast_cost_bound
-        best_probe_policy = fast_probe_policy
+        best_probe_word = fast_probe_word
         if probe_L0 != None:
             probe_word_list = [probe_L0]
         else:
@@ -1860,6 +3803,11 @@ def countMovesToDistinguishAllRemainingWords(remaining_word_list, rec_depth = 0,
             probe_word_list = gl_probe_word_list_entropy_order
         a_or_b = 'b'
 
+    #Under a ceiling, a probe word is only of use if it costs less than the ceiling.
+    if cost_ceiling != None and cost_ceiling <= best_probe_word_cost:
+        best_probe_word_cost = cost_ceiling
+        best_probe_word = None
+
     #printing progress
     #print_p = True
     print_p = False  
@@ -1874,21 +3822,23 @@ def countMovesToDistinguishAllRemainingWords(remaining_word_list, rec_depth = 0,
 
 
     num_probe_words_considered = 0
-    best_probe_word = None
 
     #The best possible count for any probe_word is one that shatters the remaining_word_list
     #into individual words which then require only one more guess each.
-    best_possible_count = len(remaining_word_list) + 1
+    #A lower bound from an earlier search under a ceiling can raise it.
+    best_possible_count = max(len(remaining_word_list) + 1, known_lower_bound)
     
-    for probe_word in probe_word_list:
-        i_probe_word = gl_probe_word_index_dict.get(probe_word)
+    #Partition the remaining answer words by the combo mark they get from each probe_word,
+    #and deal with the answer words of each mark as a bundle.
+    probe_word_index_ar = np.array([gl_probe_word_index_dict.get(probe_word) for probe_word in probe_word_list],
+                                   dtype=np.intp)
+    probe_word_partitions = partitionWordIndexArByProbeMarks(remaining_word_index_ar, probe_word_index_ar)
+    for i_probe_word, partition in zip(probe_word_index_ar.tolist(), probe_word_partitions):
         probe_word = gl_probe_word_list[i_probe_word]
         if probe_word in received_probe_word_path:
             continue
         probe_word_path = received_probe_word_path[:]
         probe_word_path.append(probe_word)
-        probe_word_mark_tree = {}  #key:   combo_mark
-                                   #value: probe_policy: [next_probe_word, next_mark_tree]
 
 #different levels of print out of progress
         if rec_depth == 0 or \
@@ -1907,155 +3857,104 @@ def countMovesToDistinguishAllRemainingWords(remaining_word_list, rec_depth = 0,
         elif rec_depth != gl_last_rec_depth:
             print(str(rec_depth) + a_or_b, end='', flush=True)
         gl_last_rec_depth = rec_depth
-        #data structures to optimize going deeper
-        remaining_words_1_dict = {}  #key:   tcombo that these answer_words got marked
-                                     #       in comparison to probe_word
-                                     #value: list: [remaining_word_list from tcombo,
-                                     #              list of answer_word that all deliver this
-                                     #              remaining_words_list]
-        probe_word_cost = 0          #cost to play the probe word incremented with every answer_word
         num_probe_words_considered += 1
-        for answer_word in remaining_word_list:
-
-            probe_word_cost += 1          #cost to play the probe word, min 1 per answer word
-            if answer_word == probe_word:
-                if print_p:
-                    print(space + 'testing answer_word: /' + answer_word + '/, matches probe word so 0 cost')
-                #this answer_word matches the probe word so requires no other probes,
-                #move on to the next answer_word
-                mark_cost = 0
-                probe_word_mark_tree[gl_correct_tcombo] = answer_word
+        bucket_mark_list, bucket_size_list, bucket_word_index_list = partition
+
+        #cost to play the probe word, min 1 per answer word
+        probe_word_cost = len(remaining_word_list)
+        #Figure a lower bound on remaining probe word cost from the whole partition before
+        #searching any mark:  the answer words of a mark need at least one more probe_word
+        #play each, and all but one of them two, so n words cost at least 2n - 1.  That is
+        #exact for one and two words.
+        #We'll update the actual probe_word cost as the real cost of each words_remaining_1 is learned.
+        #The answer word that matches the probe word requires no other probes.
+        lower_bound_from_marks = 0
+        for mark_index, n_answer_words_for_mark in zip(bucket_mark_list, bucket_size_list):
+            if mark_index == gl_correct_mark_index:
                 continue
-
-            #get mark response to probe vs. answer as a tcombo, a 5-tuple of chars in {'y', 'r', 'l'}
-            i_answer_word = gl_answer_word_index_dict.get(answer_word)
-            if i_answer_word == None:
-                print('i_answer_word is None for answer_word: ' + answer_word) #error check
-                return
-            mark_index = gl_probe_answer_word_mark_ar[i_probe_word, i_answer_word]
-            if mark_index == -1:
-                combo = markProbeWordAgainstCorrectWord(probe_word, answer_word) #list of {'y', 'r', 'l'}
-                tcombo = tuple(combo)                              #like ('y', 'r', 'l', 'l', 'y')
-                mark_index = gl_tcombo_mark_index_dict[tcombo]     #int
-                gl_probe_answer_word_mark_ar[i_probe_word, i_answer_word] = mark_index               
+            #only give up on recursing if the probe words are not restricted 
+            if n_answer_words_for_mark == len(remaining_word_list) and \
+               type(probe_L0) is not str:
+                lower_bound_from_marks += (gl_big_number + 1) * n_answer_words_for_mark  #This will send it over
             else:
-                tcombo = gl_mark_index_tcombo_dict[mark_index]     #turn int back into tcombo
-
-            #will need to call pruneWordsPerProbeResponse(), so throw all of the answer_words
-            #that return the same combo mark for probe words into a bin and deal with
-            #them as a bundle
-            answer_words_for_tcombo = remaining_words_1_dict.get(tcombo)
-            if answer_words_for_tcombo == None:
-                answer_words_for_tcombo = []
-                remaining_words_1_dict[tcombo] = answer_words_for_tcombo
-            answer_words_for_tcombo.append(answer_word)
-        #^for answer_word in remaining_word_list:
-
-        #handle the answer_words that require another probe_word play on a per combo mark basis
-        tcombo_count = 0   #for printout only 
-
-        #Figure a lower bound on remaining probe word cost based on a best case that 
-        #each remaining answer word can be hit with only one more probe_word play.
-        #We'll update the actual probe_word cost as the real cost of each words_remaining_1 is learned.
-        lower_bound_from_tcombos = 0
-        for tcombo in remaining_words_1_dict.keys():
-            lower_bound_from_tcombos += len(remaining_words_1_dict.get(tcombo))
-        probe_word_cost = probe_word_cost + lower_bound_from_tcombos
- 
+                lower_bound_from_marks += 2 * n_answer_words_for_mark - 1
+        probe_word_cost = probe_word_cost + lower_bound_from_marks
+        #no need to search any mark, this probe word is already no better than we have
+        if probe_word_cost >= best_probe_word_cost:
+            continue   #continue with next probe word
+        num_marks = len(bucket_mark_list)    #for printout only
+        if gl_correct_mark_index in bucket_mark_list:
+            num_marks -= 1
+        mark_count = 0   #for printout only 
+
         #Work through the combo mark responses to the probe word on the answer word,
-        #max num tcombos is 3^5 = 243.   
-        for tcombo in remaining_words_1_dict.keys():
-            tcombo_count += 1
-            answer_words_for_tcombo = remaining_words_1_dict.get(tcombo)
-            n_answer_words_for_tcombo = len(answer_words_for_tcombo)
-            if print_p:
-                print('\n' + space + 'answer_words for tcombo: ' + str(tcombo) + ' : ' + str(answer_words_for_tcombo))
-            cue_list = [probe_word, tcombo]
-            #costly step here
-            words_remaining_1, ccl1 = pruneWordsPerProbeResponse(remaining_word_list, cue_list)
+        #max num marks is 3^5 = 243.   
+        for i_bucket, (mark_index, n_answer_words_for_mark) in \
+                enumerate(zip(bucket_mark_list, bucket_size_list)):
+            if mark_index == gl_correct_mark_index:
+                continue
+            mark_count += 1
             if print_p:
-                wrl_str = '(' + str(len(words_remaining_1)) + ')'
-                if len(words_remaining_1) <= 8:
-                    wrl_str += str(words_remaining_1)
-                if print_p:
-                    print('\n' + space + 'after applying probe:/' + probe_word + '/ to rem_word_list:' + str(len(remaining_word_list)) + ', each of the ' + str(len(answer_words_for_tcombo)) + ' answer_words: ' + str(answer_words_for_tcombo) + ' got tcombo: ' + str(tcombo) + ' each giving words_remaining_1: ' + str(len(words_remaining_1)) + ' : ' + wrl_str)
-
-            #probe_word has narrowed down to one remaining answer word
-            if len(words_remaining_1) == 1:
-                if words_remaining_1[0] == answer_words_for_tcombo[0]:
-                    if print_p:
-                        print(space + 'words_remaining_1: ' + str(words_remaining_1) + ' matches answer_word, mark_dict is 1')
-                    mark_cost = 1
-                    #this will be a wash in terms of probe_word_cost
-                    probe_word_mark_tree[tcombo] = words_remaining_1
-                    #check for no need to look at any other words, this probe word is already
-                    #no better than we have
-                    if probe_word_cost >= best_probe_word_cost:
-                        break   #break to next probe word
-                    continue    #continue with next tcombo
-
-            words_remaining_1.sort()
-            tup_wds_rem_1 = tuple(words_remaining_1)
-            #only give up on recursing if the probe words are not restricted 
-            if len(words_remaining_1) == len(remaining_word_list) and \
-               type(probe_L0) is not str:
-                mark_cost = gl_big_number + 1  #This will send it over
-                probe_word_cost += mark_cost * n_answer_words_for_tcombo
-                probe_word_mark_tree[tcombo] = words_remaining_1
-                #no need to look at any other words, this probe word is useless
-                if probe_word_cost >= best_probe_word_cost:  
-                    break    #break to next probe word
-                continue     #continue with next tcombo
-                
-            if len(words_remaining_1) == 2:
-                mark_cost = 3  # [w1, w2] costs 3:  w1: probe(w1) ; w2: probe(w1) + probe(w2)
-                probe_word_cost += 1  #mark cost minus 2 already talled as min for these words remaining
-                probe_word_mark_tree[tcombo] = words_remaining_1
-                #check for no need to look at any other words, this probe word is already
-                #no better than we have
-                if probe_word_cost >= best_probe_word_cost:
-                    break   #break to next probe_word
-                continue    #continue with next tcombo
+                answer_words_for_mark = [gl_answer_word_list[i_word] for i_word in bucket_word_index_list[i_bucket]]
+                print('\n' + space + 'answer_words for mark_index: ' + markIndexToCharResponse(mark_index) + ' : ' + str(answer_words_for_mark))
+
+            #One word costs 1 and [w1, w2] costs 3:  w1: probe(w1) ; w2: probe(w1) + probe(w2),
+            #already tallied in the lower bound, as is a mark that leaves all of the words.
+            if n_answer_words_for_mark <= 2 or \
+               (n_answer_words_for_mark == len(remaining_word_list) and type(probe_L0) is not str):
+                continue    #continue with next mark_index
 
             #Will need to recurse to get cost for the answer words that this probe word
             #narrows down to. 
-            #First, is the answer in the cache?
-            mark_cost_probe_policy_list = gl_word_set_probe_cost_cache[bound_intent].get(tup_wds_rem_1)
-            if mark_cost_probe_policy_list != None:
-                mark_cost = mark_cost_probe_policy_list[0]
-                next_level_probe_policy = mark_cost_probe_policy_list[1]
-                probe_word_cost += mark_cost - n_answer_words_for_tcombo
-                probe_word_mark_tree[tcombo] = next_level_probe_policy
+            #First, is the answer in the transposition table?
+            words_remaining_1_key = makeBucketZobristKey(remaining_word_key, len(remaining_word_list),
+                                                         bucket_word_index_list, i_bucket)
+            mark_lower_bound = 2 * n_answer_words_for_mark - 1
+            #The probe word only beats the best so far if this mark costs less than this ceiling,
+            #which is passed down so the search of the mark can give up as soon as it cannot.
+            #Until some probe word has completed there is no best to beat, and no ceiling, so
+            #a fast search of the mark that completes no probe word still adds a probe word
+            #and tries again.
+            mark_cost_ceiling = None
+            if best_probe_word_cost < gl_big_number:
+                mark_cost_ceiling = best_probe_word_cost - probe_word_cost + mark_lower_bound
+            mark_cost_probe_word_list = lookupProbeWordCost(bound_intent, words_remaining_1_key,
+                                                            n_answer_words_for_mark)
+            if mark_cost_probe_word_list != None and \
+               (mark_cost_probe_word_list[2] == gl_bound_exact or
+                (mark_cost_probe_word_list[2] == gl_bound_lower and mark_cost_ceiling != None and
+                 mark_cost_probe_word_list[0] >= mark_cost_ceiling)):
+                mark_cost = mark_cost_probe_word_list[0]
+                probe_word_cost += mark_cost - mark_lower_bound
                 if print_p:
-                    print('\n' + space + 'L' + str(rec_depth) + ' for tup_wds_rem_1: ' + str(tup_wds_rem_1) + ' got from dict L' + str(rec_depth) + ' with mark_cost: ' + str(mark_cost) + ' probe_word_cost in progress is now ' + str(probe_word_cost) + ' best probe_word_cost: ' + str(best_probe_word_cost))
-                    print('gl_word_set_probe_cost_cache: ' + str(gl_word_set_probe_cost_cache))
+                    print('\n' + space + 'L' + str(rec_depth) + ' for words_remaining_1: ' + str(bucket_word_index_list[i_bucket]) + ' got from table L' + str(rec_depth) + ' with mark_cost: ' + str(mark_cost) + ' probe_word_cost in progress is now ' + str(probe_word_cost) + ' best probe_word_cost: ' + str(best_probe_word_cost))
+                    printTranspositionTableStats()
 
             #Have to actually recurse to get the answer.
             else:
-                next_aw_print_str = ' (pw-L' + str(rec_depth) + '(' + str(tcombo_count) + ' of ' + str(len(remaining_words_1_dict)) + ') : ' + probe_word + ' ' + str(tcombo) + ' ' + str(probe_word_cost) + '/' + str(best_probe_word_cost) + ')'
-                mark_cost, next_level_probe_policy = \
+                #one bitset AND with the answer words that get this mark from probe_word
+                words_remaining_1 = remaining_word_set & getProbeMarkAnswerWordSet(i_probe_word, mark_index)
+                next_aw_print_str = ' (pw-L' + str(rec_depth) + '(' + str(mark_count) + ' of ' + str(num_marks) + ') : ' + probe_word + ' ' + markIndexToCharResponse(mark_index) + ' ' + str(probe_word_cost) + '/' + str(best_probe_word_cost) + ')'
+                mark_cost, next_level_probe_word = \
                         countMovesToDistinguishAllRemainingWords(words_remaining_1,
                                                                  rec_depth+1,
                                                                  None,
                                                                  probe_word_path,
-                                                                 tcombo,
+                                                                 mark_index,
                                                                  next_aw_print_str,
-                                                                 bound_intent)
-                #write it now because it could be used again within this call to
-                #countMoves...()
-                gl_word_set_probe_cost_cache[bound_intent][tup_wds_rem_1] = \
-                                                        [mark_cost, next_level_probe_policy]
-
-                probe_word_cost += mark_cost - n_answer_words_for_tcombo
-                probe_word_mark_tree[tcombo] = next_level_probe_policy
+                                                                 bound_intent,
+                                                                 mark_cost_ceiling,
+                                                                 words_remaining_1_key,
+                                                                 mark_cost_probe_word_list or [])
+                probe_word_cost += mark_cost - mark_lower_bound
 
                 if print_p:
-                    print('\n' + space + 'got back to L' + str(rec_depth) + ' testing probe_word: ' + probe_word + ' on answer_word: /' + answer_word + '/ with mark_cost: ' + str(mark_cost) + ' probe_word_cost in progress is now ' + str(probe_word_cost) + ' best probe_word_cost: ' + str(best_probe_word_cost))
+                    print('\n' + space + 'got back to L' + str(rec_depth) + ' testing probe_word: ' + probe_word + ' on mark_index: ' + markIndexToCharResponse(mark_index) + ' with mark_cost: ' + str(mark_cost) + ' probe_word_cost in progress is now ' + str(probe_word_cost) + ' best probe_word_cost: ' + str(best_probe_word_cost))
 
                 if probe_word_cost >= best_probe_word_cost:
                     print(';', end='', flush=True)
                     break    #break to next probe_word
-        #^for tcombo in remaining_words_1_dict.keys():                
+        #^for mark_index in bucket_mark_list:
 
         #This test should have been performed already but just to make sure...
         if probe_word_cost >= best_probe_word_cost:
@@ -2069,24 +3968,32 @@ def countMovesToDistinguishAllRemainingWords(remaining_word_list, rec_depth = 0,
                 return
             best_probe_word_cost = probe_word_cost
             best_probe_word = probe_word
-            best_probe_policy = [probe_word, probe_word_mark_tree]
 
         #Another way to exit early.
         if best_probe_word_cost == best_possible_count:
-            #whatever we learned from this call, store it in the cache
-            gl_word_set_probe_cost_cache[bound_intent][tup_rem_wds_list] = \
-                                        [best_probe_word_cost, best_probe_policy]
+            #whatever we learned from this call, store it in the transposition table
+            if probe_L0 == None:
+                storeProbeWordCost(bound_intent, remaining_word_key, len(remaining_word_list),
+                                   best_probe_word_cost, best_probe_word)
             if print_p or rec_depth <= 2:
                 wl_print = ''
                 if len(remaining_word_list) < 6:
                     wl_print = ': ' + str(remaining_word_list)
                 print('\n' + space + ' L' + str(rec_depth) + a_or_b + ' returning early for remaining_word_list size ' + str(len(remaining_word_list)) + wl_print + ' returning best_probe_word: ' + str(best_probe_word) + ' best_probe_word_cost: ' + str(best_probe_word_cost) + '(best possible)  num_probe_words_considered: ' + str(num_probe_words_considered) + ' ', end='')
             if rec_depth == 0:
-                print('\n\n Returning ' + bound_intent + ' cost ' + str(best_probe_word_cost) + ' probe_policy: ' + str(best_probe_policy) + '\n\n')
+                print('\n\n Returning ' + bound_intent + ' cost ' + str(best_probe_word_cost) + ' best_probe_word: ' + str(best_probe_word))
+                printTranspositionTableStats()
 
-            return best_probe_word_cost, best_probe_policy
+            return best_probe_word_cost, best_probe_word
     #^for probe_word in probe_word_list:        
 
+    #No probe word costs less than the ceiling, so its cost is a lower bound.
+    if best_probe_word == None and cost_ceiling != None:
+        if probe_L0 == None:
+            storeProbeWordCost(bound_intent, remaining_word_key, len(remaining_word_list),
+                               best_probe_word_cost, None, gl_bound_lower)
+        return best_probe_word_cost, None
+
     #If we haven't found any probe word to split the answer words, we'll need to add
     #to the probe_word set.  This applies only in fast mode where an answer_word might
     #not be in the probe_word_list.
@@ -2107,7 +4014,8 @@ def countMovesToDistinguishAllRemainingWords(remaining_word_list, rec_depth = 0,
         #call self again
         return countMovesToDistinguishAllRemainingWords(remaining_word_list, rec_depth,
                                                         probe_L0, received_probe_word_path,
-                                                        prev_level_tcombo, aw_print_str, bound_intent)
+                                                        prev_level_mark_index, aw_print_str, bound_intent,
+                                                        None, remaining_word_key)
 
     #development and debugging
     possiblyAddToHighScorePathsDict(best_probe_word_cost, best_probe_word, probe_word_path, remaining_word_list)
@@ -2118,19 +4026,21 @@ def countMovesToDistinguishAllRemainingWords(remaining_word_list, rec_depth = 0,
             wl_print = ': ' + str(remaining_word_list)
         print('\n' + space + ' L' + str(rec_depth) + a_or_b + ' returning for remaining_word_list size ' + str(len(remaining_word_list)) + wl_print + ' returning best_probe_word: ' + str(best_probe_word) + ' best_probe_word_cost: ' + str(best_probe_word_cost) + '  num_probe_words_considered: ' + str(num_probe_words_considered) + ' ', end='')
 
-    #whatever we learned from this call, store it in the cache
-    gl_word_set_probe_cost_cache[bound_intent][tup_rem_wds_list] = \
-                                    [best_probe_word_cost, best_probe_policy]
+    #whatever we learned from this call, store it in the transposition table
+    if probe_L0 == None:
+        storeProbeWordCost(bound_intent, remaining_word_key, len(remaining_word_list),
+                           best_probe_word_cost, best_probe_word)
     if rec_depth == 0:
-        print('\n\n Returning ' + bound_intent + ' cost ' + str(best_probe_word_cost) + ' probe_policy: ' + str(best_probe_policy) + '\n\n')
-    return best_probe_word_cost, best_probe_policy
+        print('\n\n Returning ' + bound_intent + ' cost ' + str(best_probe_word_cost) + ' best_probe_word: ' + str(best_probe_word))
+        printTranspositionTableStats()
+    return best_probe_word_cost, best_probe_word
 
 
 
 #A probe_policy is a list:
 #[probe_word, mark_tree]
 #where
-#mark_tree is a dict:  key: tuple combo_mark
+#mark_tree is a dict:  key: int mark_index
 #                      value: either
 #                        -a list of remaining_answer_words delivered by the probe_word_path to this level
 #                        -a probe_policy (list: [next probe_word and mark_tree])
@@ -2139,52 +4049,52 @@ def printProbePolicy(probe_policy, indent = 0):
     space = ' ' * indent
     probe_word = probe_policy[0]
     mark_dict = probe_policy[1]
-    tcombos = list(mark_dict.keys())
-    tcombo0 = tcombos[0]
-    next_level_policy = mark_dict.get(tcombo0)
+    marks = list(mark_dict.keys())
+    mark_index0 = marks[0]
+    next_level_policy = mark_dict.get(mark_index0)
     if type(next_level_policy) is str:
-        print(space + probe_word + '  ' + str(tcombo0) + ': ' + next_level_policy)
-    elif next_level_policy == None:   #an unpruned policy tree with None entries for a tcombo
-        print(space + probe_word + '  ' + str(tcombo0) + ': None')
+        print(space + probe_word + '  ' + markIndexToCharResponse(mark_index0) + ': ' + next_level_policy)
+    elif next_level_policy == None:   #an unpruned policy tree with None entries for a mark_index
+        print(space + probe_word + '  ' + markIndexToCharResponse(mark_index0) + ': None')
     elif len(next_level_policy) == 1:
-        print(space + probe_word + '  ' + str(tcombo0) + ': ' + str(next_level_policy))
+        print(space + probe_word + '  ' + markIndexToCharResponse(mark_index0) + ': ' + str(next_level_policy))
     elif type(next_level_policy[1]) is not dict:
         if len(next_level_policy) != 2:
             print('expected two answer words here: ' + str(next_level_policy))
             return
         #construct a two_word next_level_policy,
         #the combo leading to the altnerative is not known
-        #print('should be printing prate here: tcombo0: ' + str(tcombo0))
-        print(space + probe_word + '  ' + str(tcombo0) + ': ')
-        two_word_nlp = [next_level_policy[0], {('r', 'r', 'r', 'r', 'r'): next_level_policy[0],
-                                               ('x', 'x', 'x', 'x', 'x'):
+        #print('should be printing prate here: mark_index0: ' + markIndexToCharResponse(mark_index0))
+        print(space + probe_word + '  ' + markIndexToCharResponse(mark_index0) + ': ')
+        two_word_nlp = [next_level_policy[0], {gl_correct_mark_index: next_level_policy[0],
+                                               -1:   #prints as 'xxxxx'
                                                [next_level_policy[1]]}]
         printProbePolicy(two_word_nlp, indent + 20)
     else:
-        print(space + probe_word + '  ' + str(tcombo0) + ': ')
+        print(space + probe_word + '  ' + markIndexToCharResponse(mark_index0) + ': ')
         printProbePolicy(next_level_policy, indent + 20)
-    if len(tcombos) < 2:
-        print('tcombos < 2 so returning')
+    if len(marks) < 2:
+        print('marks < 2 so returning')
         return
-    for tcombo in tcombos[1:]:
-        next_level_policy = mark_dict.get(tcombo)  
+    for mark_index in marks[1:]:
+        next_level_policy = mark_dict.get(mark_index)  
         if type(next_level_policy) is str:      #probe word is answer word
-            print(space + probe_word + '  ' + str(tcombo0) + ': ' + next_level_policy)           
+            print(space + probe_word + '  ' + markIndexToCharResponse(mark_index0) + ': ' + next_level_policy)           
         elif len(next_level_policy) == 1:       #a single word candidate after probe
-            print(space + '     ' + '  ' + str(tcombo) + ': ' + str(next_level_policy))
+            print(space + '     ' + '  ' + markIndexToCharResponse(mark_index) + ': ' + str(next_level_policy))
         elif type(next_level_policy[1]) is not dict:
             if len(next_level_policy) != 2:
                 print('expected two answer words here: ' + str(next_level_policy))
                 return
             #construct a two_word next_level_policy,
             #the combo leading to the altnerative is not known
-            print(space + '     ' + '  ' + str(tcombo) + ': ')
-            two_word_nlp = [next_level_policy[0], {('r', 'r', 'r', 'r', 'r'): next_level_policy[0],
-                                                   ('x', 'x', 'x', 'x', 'x'):
+            print(space + '     ' + '  ' + markIndexToCharResponse(mark_index) + ': ')
+            two_word_nlp = [next_level_policy[0], {gl_correct_mark_index: next_level_policy[0],
+                                                   -1:   #prints as 'xxxxx'
                                                    [next_level_policy[1]]}]
             printProbePolicy(two_word_nlp, indent + 20)
         else:
-            print(space + '     ' + '  ' + str(tcombo) + ': ')
+            print(space + '     ' + '  ' + markIndexToCharResponse(mark_index) + ': ')
             printProbePolicy(next_level_policy, indent + 20)
 
 
@@ -2192,7 +4102,7 @@ def printProbePolicy(probe_policy, indent = 0):
 #This takes a probe_policy returned by def countMovesToDistinguishAllRemainingWords(),
 #and enumerates the probe_word path to each answer_word leaf node in the tree.
 #Returns a list of list [probe_word, probe_word, probe_word, ... answer_word]
-#mark_dict is a dict:  key: tuple combo_mark
+#mark_dict is a dict:  key: int mark_index
 #                      value: either
 #                        -a list of remaining_answer_words delivered by the probe_word_path to this level
 #                        -a probe_policy (list: [next probe_word and mark_tree])
@@ -2205,9 +4115,8 @@ def buildSearchPathForAllWordsInProbePolicy(probe_policy, path_to_here = None):
     probe_word = probe_policy[0]
     path_to_here.append(probe_word)
     mark_dict = probe_policy[1]
-    tcombos = list(mark_dict.keys())
-    for tcombo in tcombos:
-        items = mark_dict.get(tcombo)
+    for mark_index in mark_dict.keys():
+        items = mark_dict.get(mark_index)
         #can only be an answer word
         if type(items) is str:    
             answer_word_path = path_to_here[:]
@@ -2255,9 +4164,9 @@ def convertProbePolicyToJsonWritable(probe_policy):
     if type(tdict) is not dict:
         return probe_policy
     new_tdict = {}
-    for tcombo in tdict.keys():
-        str_combo = ''.join(tcombo)
-        next_tdict = tdict.get(tcombo)
+    for mark_index in tdict.keys():
+        str_combo = markIndexToCharResponse(mark_index)
+        next_tdict = tdict.get(mark_index)
         new_tdict[str_combo] = convertProbePolicyToJsonWritable(next_tdict)
     return [probe_policy[0], new_tdict]
 
@@ -2266,6 +4175,8 @@ def convertProbePolicyToJsonWritable(probe_policy):
 
 
 #Computes entropy of every probe_word in probe_word_list for the answer_word_list passed.
+#When the words are in the probe and answer word lists, the entropies of all of the probe
+#words are computed at once over the mark table by figureProbeWordEntropyArs().
 #sorts by entropy high to low
 #returns a list of list: [probe_word, float entropy]
 def figureProbeWordEntropies(probe_word_list = None, answer_word_list = None):
@@ -2273,6 +4184,13 @@ def figureProbeWordEntropies(probe_word_list = None, answer_word_list = None):
         probe_word_list = gl_probe_word_list
     if answer_word_list == None:
         answer_word_list = gl_answer_word_list
+    probe_word_index_ar = makeWordIndexAr(probe_word_list, gl_probe_word_index_dict)
+    answer_word_index_ar = makeWordIndexAr(answer_word_list, gl_answer_word_index_dict)
+    if probe_word_index_ar is not None and answer_word_index_ar is not None:
+        entropy_ar = figureProbeWordEntropyArs(answer_word_index_ar, probe_word_index_ar)
+        entropy_scores = list(zip(probe_word_list, entropy_ar.tolist()))
+        entropy_scores.sort(key = lambda x: x[1], reverse = True)
+        return entropy_scores
     entropy_scores = []
     count = 0
     prog_freq = 10000000000/(len(probe_word_list) * len(answer_word_list))
@@ -2288,26 +4206,35 @@ def figureProbeWordEntropies(probe_word_list = None, answer_word_list = None):
     return entropy_scores
 
 def figureProbeWordEntropyOnAnswerWords(probe_word, answer_word_list = None):
-    mark_count_ar = np.zeros(243)
     if answer_word_list == None:
         answer_word_list = gl_answer_word_list
-
-    for answer_word in answer_word_list:
-        combo = markProbeWordAgainstCorrectWord(probe_word, answer_word)
-        tcombo = tuple(combo)
-        mark_index = gl_tcombo_mark_index_dict[tcombo]
-        mark_count_ar[mark_index] += 1
-
-    answer_word_count = len(answer_word_list)
-    total_entropy= 0
-    for mark_index in range(243):
-        count = mark_count_ar[mark_index]
-        if count == 0:
-            continue
-        p = count/answer_word_count
-        entropy = -p * math.log(p, 2)
-        total_entropy += entropy
-    return total_entropy
+    mark_count_ar = np.bincount(markProbeWordAgainstAnswerWords(probe_word, answer_word_list),
+                                minlength=243)
+    return float(figureEntropiesPerMarkCounts(mark_count_ar))
+
+
+#Returns a numpy array of the entropy of every probe word in probe_word_index_ar, indices
+#into gl_probe_word_list, on the answer words in answer_word_index_ar, indices into
+#gl_answer_word_list.  The mark histograms of a block of probe words are counted at once from
+#the mark table, see countProbeWordMarks().
+def figureProbeWordEntropyArs(answer_word_index_ar, probe_word_index_ar, block_rows = 1024):
+    entropy_ar = np.zeros(len(probe_word_index_ar), dtype=np.float64)
+    for i_start in range(0, len(probe_word_index_ar), block_rows):
+        block_index_ar = probe_word_index_ar[i_start:i_start + block_rows]
+        entropy_ar[i_start:i_start + len(block_index_ar)] = \
+            figureEntropiesPerMarkCounts(countProbeWordMarks(block_index_ar, answer_word_index_ar))
+    return entropy_ar
+
+
+#mark_count_ar is a numpy array [..., 243] of the number of words that get each mark.
+#Returns the entropy in bits of the distribution of marks, per row.
+#The counts are sorted first, so that probe words that split the words the same way
+#get exactly the same entropy and sort as ties.
+def figureEntropiesPerMarkCounts(mark_count_ar):
+    mark_count_ar = np.sort(mark_count_ar, axis=-1)
+    p_ar = mark_count_ar / np.maximum(1, mark_count_ar.sum(axis=-1, keepdims=True))
+    log_p_ar = np.log2(np.where(p_ar > 0, p_ar, 1))
+    return -(p_ar * log_p_ar).sum(axis=-1)
 
 gl_probe_word_entropies_filename = 'probe-words-12972-entropies-on-answer-words-2315.text'
 
@@ -2320,6 +4247,22 @@ def writeProbeWordEntropiesToFile(entropy_score_list, filename = None):
             str_score = score[0] + ' ' + str(score[1]) + '\n'
             file.write(str_score)
 
+#Sets gl_probe_word_entropies_list from its file.  If there is no file, the entropies are
+#computed, which takes seconds, and written to the file.
+def loadProbeWordEntropies(filename = None):
+    global gl_probe_word_entropies_list
+    if filename == None:
+        filename = gl_probe_word_entropies_filename
+    entropy_score_list = None
+    if findDataFilepath(filename) != None:
+        entropy_score_list = readProbeWordEntropiesFromFile(filename)
+    if entropy_score_list == None:
+        print('computing probe word entropies and writing them to ' + filename)
+        entropy_score_list = figureProbeWordEntropies()
+        writeProbeWordEntropiesToFile(entropy_score_list, filename)
+    gl_probe_word_entropies_list = entropy_score_list
+
+
 #returns entropy_score_list,  a list of tuple (probe_word, float entropy)
 def readProbeWordEntropiesFromFile(filename = None):
     if filename == None:
@@ -2379,7 +4322,9 @@ def readWordListFromFile(filename):
 #This applies the initial probe word passed (e.g. 'raise' or 'salet') which splits
 #the answer_word_list into 243 bins per response_combo mark.
 #For each of these bins, this computes the entropies of the remaining probe words.
-#Returns a dict: key: tcombo: 5-tuple of 'r', 'l', 'y'
+#When the words are in the probe and answer word lists, this is done over the mark table
+#by figureLevel1ProbeWordEntropiesPerMarkTable(), which takes seconds for any opener.
+#Returns a dict: key: int mark_index
 #                value: list: [num_answer_words, sorted list of tuple (probe_word, entropy)]
 def figureLevel1ProbeWordEntropiesGivenProbeWordSplit(level_0_probe_word, answer_word_list=None,
                                                       probe_word_list = None, keep_first_n=100):
@@ -2389,26 +4334,63 @@ def figureLevel1ProbeWordEntropiesGivenProbeWordSplit(level_0_probe_word, answer
         probe_word_list = gl_probe_word_list
     probe_word_list_m1 = probe_word_list[:]
     probe_word_list_m1.remove(level_0_probe_word)
-    level_1_entropies_dict = {}  #key:   tcombo: 5-tuple of 'r', 'l', 'y'
+    i_level_0_probe_word = gl_probe_word_index_dict.get(level_0_probe_word)
+    probe_word_index_ar = makeWordIndexAr(probe_word_list_m1, gl_probe_word_index_dict)
+    answer_word_index_ar = makeWordIndexAr(answer_word_list, gl_answer_word_index_dict)
+    if i_level_0_probe_word != None and probe_word_index_ar is not None and answer_word_index_ar is not None:
+        return figureLevel1ProbeWordEntropiesPerMarkTable(i_level_0_probe_word, answer_word_index_ar,
+                                                          probe_word_index_ar, keep_first_n)
+    level_1_entropies_dict = {}  #key:   int mark_index
                                  #value: sorted list of tuple (probe_word, entropy)
     combos_count = 0
-    combos = generateAllCharResponseCombos()
-    for combo in combos:
+    for mark_index in range(243):
         combos_count += 1
-        cue_list = [level_0_probe_word, combo]
+        cue_list = [level_0_probe_word, mark_index]
         words_remaining_1, ccl1 = pruneWordsPerProbeResponse(answer_word_list, cue_list)
-        print('\n' + str(combos_count) + '  ' + str(combo) + '  answer_word count: ' + str(len(words_remaining_1)) + '   ', end='', flush=True)
+        print('\n' + str(combos_count) + '  ' + markIndexToCharResponse(mark_index) + '  answer_word count: ' + str(len(words_remaining_1)) + '   ', end='', flush=True)
         if len(words_remaining_1) == 0:
             continue
         entropies = figureProbeWordEntropies(probe_word_list_m1, words_remaining_1)
-        tcombo = tuple(combo)
-        level_1_entropies_dict[tcombo] = [len(words_remaining_1), entropies[0:keep_first_n]]
+        level_1_entropies_dict[mark_index] = [len(words_remaining_1), entropies[0:keep_first_n]]
     print('')
     return level_1_entropies_dict
 
 
+#This is figureLevel1ProbeWordEntropiesGivenProbeWordSplit() over the mark table.
+#The answer words in answer_word_index_ar are grouped by the mark they get from the level 0
+#probe word, by a stable sort of the level 0 probe word's row of marks.  The entropies of all
+#of the probe words in probe_word_index_ar on each group are computed at once by
+#figureProbeWordEntropyArs(), and the keep_first_n highest are picked with argpartition.
+#Ties are kept in probe_word_index_ar order, as the stable sort in figureProbeWordEntropies().
+def figureLevel1ProbeWordEntropiesPerMarkTable(i_level_0_probe_word, answer_word_index_ar,
+                                               probe_word_index_ar, keep_first_n = 100):
+    probe_answer_word_mark_ar = getProbeAnswerWordMarkRows([i_level_0_probe_word])
+    level_0_mark_ar = probe_answer_word_mark_ar[i_level_0_probe_word][answer_word_index_ar]
+    order_ar = np.argsort(level_0_mark_ar, kind='stable')
+    mark_start_ar = np.searchsorted(level_0_mark_ar[order_ar], np.arange(244))
+    level_1_entropies_dict = {}  #key:   int mark_index
+                                 #value: sorted list of tuple (probe_word, entropy)
+    for mark_index in range(243):
+        words_remaining_1_index_ar = answer_word_index_ar[order_ar[mark_start_ar[mark_index]:mark_start_ar[mark_index + 1]]]
+        print(str(mark_index + 1) + '  ' + markIndexToCharResponse(mark_index) + '  answer_word count: ' + str(len(words_remaining_1_index_ar)))
+        if len(words_remaining_1_index_ar) == 0:
+            continue
+        entropy_ar = figureProbeWordEntropyArs(words_remaining_1_index_ar, probe_word_index_ar)
+        if keep_first_n < len(entropy_ar):
+            #the probe words at least as high as the keep_first_n-th highest, ties included
+            kth_entropy = entropy_ar[np.argpartition(-entropy_ar, keep_first_n - 1)[keep_first_n - 1]]
+            top_i_probe_ar = np.flatnonzero(entropy_ar >= kth_entropy)
+        else:
+            top_i_probe_ar = np.arange(len(entropy_ar))
+        top_i_probe_ar = top_i_probe_ar[np.argsort(-entropy_ar[top_i_probe_ar], kind='stable')][0:keep_first_n]
+        entropies = [(gl_probe_word_list[probe_word_index_ar[i_probe]], float(entropy_ar[i_probe]))
+                     for i_probe in top_i_probe_ar]
+        level_1_entropies_dict[mark_index] = [len(words_remaining_1_index_ar), entropies]
+    return level_1_entropies_dict
+
+
 #large, every response combo mark has an entropies list of only the 100 highest entropy
-#probe words on the answer_words remaining after application of the key combo_mark
+#probe words on the answer_words remaining after application of the key mark
 #from the probe_word 'salet'
 #No longer used
 gl_level_1_probe_word_100_entropies_dict_filename = 'level-1-probe-word-100-entropies-dict-salet.text'
@@ -2423,12 +4405,13 @@ def writeLevel1ProbeWordEntropiesDictToFile(level_1_probe_word_100_entropies_dic
         filename = gl_level_1_probe_word_100_entropies_dict_filename
     return writeDictToFile(level_1_probe_word_100_entropies_dict, filename)
 
+#a_dict is keyed by mark_index
 def writeDictToFile(a_dict, filename):
     print('writing to file: ' + filename)
     a_dict2 = {}   
-    for tup_key in a_dict.keys():   #need to convert keys from tuple of char to a str
-        str_key = ''.join(tup_key)
-        a_dict2[str_key] = a_dict.get(tup_key)
+    for mark_index in a_dict.keys():   #need to convert keys from mark index to a char response str
+        str_key = markIndexToCharResponse(mark_index)
+        a_dict2[str_key] = a_dict.get(mark_index)
     with open(filename, 'w', encoding='utf-8') as file:
         output_str = json.dumps(a_dict2, indent=4)
         output_str += '\n'
@@ -2444,8 +4427,7 @@ def readLevel1ProbeWordEntropiesDictFromFile(filename = None):
     print('got dictionary...')
     the_dict2 = {}
     for key in the_dict.keys():
-        tcombo = tuple([char for char in key])
-        the_dict2[tcombo] = the_dict.get(key)
+        the_dict2[charResponseToMarkIndex(key)] = the_dict.get(key)
     if filename.find('salet') > 0:
         global gl_level_1_probe_word_100_entropies_dict_salet
         gl_level_1_probe_word_100_entropies_dict_salet = the_dict2
@@ -2487,7 +4469,8 @@ def readDictFromFile(filename):
 #A PNode is a decision node in a policy for choosing probe words in Wordle.
 #In operation, a PNode is arrived at when its probe_word has been chosen.
 #Applying the probe_word to the game, the game will respond with a mark.
-#A mark (equivalent to response_combo), is a list or tuple of 'r', 'l', 'y'.
+#A mark (equivalent to response_combo), is a list or tuple of 'r', 'l', 'y',
+#which the program carries as its mark index.
 #There are 3^5 = 243 possible marks.
 #The PNode has one child PNode node per mark.  The mark directs the play down
 #to the child PNode which tells which probe word to play next.
@@ -2564,9 +4547,7 @@ class PNode(object):
             return 1
         if type(self.child_pn_ar) is PNode:
             return self.child_pn_ar.countCostToFindAnswerWord(answer_word, answer_word_list) + 1
-        combo = markProbeWordAgainstCorrectWord(self.probe_word, answer_word)
-        tcombo = tuple(combo)        
-        mark_index = gl_tcombo_mark_index_dict[tcombo]
+        mark_index = markProbeWordAgainstCorrectWord(self.probe_word, answer_word)
         selected_child_pn = self.child_pn_ar[mark_index]
         return selected_child_pn.countCostToFindAnswerWord(answer_word, answer_word_list) + 1
 
@@ -2589,9 +4570,7 @@ class PNode(object):
             if type(selected_child_pn.child_pn_ar) is PNode:
                 selected_child_pn = selected_child_pn.child_pn_ar
             else:
-                combo = markProbeWordAgainstCorrectWord(selected_child_pn.probe_word, answer_word)
-                tcombo = tuple(combo)        
-                mark_index = gl_tcombo_mark_index_dict[tcombo]
+                mark_index = markProbeWordAgainstCorrectWord(selected_child_pn.probe_word, answer_word)
                 selected_child_pn = selected_child_pn.child_pn_ar[mark_index]
         print('problem in countCostToFindAnswerWord(' + self.name + ', ' + answer_word + ', answer_word_list ' + str(len(answer_word_list)) + ': selected_child_pn should not be None')
 